@@ -9,23 +9,23 @@ Changes in this version:
 """
 
 import os
+import io
 import sys
+import asyncio
 import re
+import json
+import hashlib
+import difflib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 import argparse
 import tempfile
 import shutil
 import time
-from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple, List
-
-# Try to load .env, but don't crash if missing
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+from typing import Optional, Tuple, List, Union
 
 # ==========================================
 # ⚙  USER CONFIGURATION
@@ -35,6 +35,10 @@ except ImportError:
 MODEL_GENERATOR = "zaguanai/gemini-3-pro-preview"
 MODEL_VERIFIER  = "zaguanai/claude-sonnet-4.5-latest"
 
+# Sampling temperatures: creative drafting, deterministic verify/repair
+TEMPERATURE_GEN = 0.7
+TEMPERATURE_VER = 0.0
+
 # ==========================================
 
 SIZE_PRESETS = {
@@ -44,6 +48,20 @@ SIZE_PRESETS = {
     "4k":    (3840, 2160),
 }
 
+# Markdown fences the models sometimes wrap their SDL in
+_FENCE_OPEN = re.compile(r'^```(?:povray|pov)?\s*\n', re.MULTILINE)
+_FENCE_CLOSE = re.compile(r'\n```\s*$', re.MULTILINE)
+
+# Cheap structural checks used to decide whether a draft needs the verifier
+_CAMERA_BLOCK = re.compile(r'\bcamera\s*\{')
+_LIGHT_BLOCK = re.compile(r'\blight_source\s*\{')
+
+# POV-Ray 3.7 error location, e.g. "File 'scene.pov' line 12: Parse Error: ..."
+_ERROR_LOCATION = re.compile(r"File '([^']+)' line (\d+)")
+
+# Lines of context either side of the error sent to the fixer on later retries
+FIX_WINDOW = 10
+
 # --- The Template ---
 BASE_SCENE_TEMPLATE = """
 #version 3.7;
@@ -66,9 +84,24 @@ global_settings {
 // Note: No default camera or lights. The AI MUST generate them.
 """
 
+BASE_INCLUDE_NAME = "precompiled_base.pov"
+AI_BODY_NAME = "ai_body.pov"
+SCENE_NAME = "scene.pov"
+
+# Encoded once; scene files are written in binary mode from these buffers
+_TEMPLATE_BYTES = BASE_SCENE_TEMPLATE.encode("utf-8")
+_AI_MARKER = "\n// --- AI Generated Content Below ---\n"
+_HISTORY_HEADER = _TEMPLATE_BYTES + _AI_MARKER.encode("utf-8")
+_TEMP_HEADER = f'#include "{BASE_INCLUDE_NAME}"\n{_AI_MARKER}'.encode("utf-8")
+# Static render scene: only AI_BODY_NAME is rewritten between repair attempts
+_SCENE_BYTES = f'#include "{BASE_INCLUDE_NAME}"\n#include "{AI_BODY_NAME}"\n'.encode("utf-8")
+
 # ==============================================================================
 #  SYSTEM PROMPTS
 # ==============================================================================
+# Providers cache the longest identical prompt prefix, so everything invariant
+# lives in these constants and only the per-request data goes in the user
+# message (least volatile first, most volatile last).
 
 SYSTEM_PROMPT_GEN = r"""
 You are rayLM, a high-fidelity POV-Ray 3.7 Scene Description Generator.
@@ -197,16 +230,46 @@ VERIFICATION PROCEDURE:
 
 RETURN:
 - Fully corrected SDL code only.
+
+Review the code. Fix syntax errors. Ensure compliance with POV-Ray 3.7 standards.
+Return FINAL CODE only.
+
+The following preamble is prepended to the code at render time (do not repeat it):
+""" + BASE_SCENE_TEMPLATE
+
+SYSTEM_PROMPT_FIXER = r"""
+You are a POV-Ray Debugger.
+
+INPUTS:
+1. Failed code
+2. Renderer error log
+
+Fix the syntax error shown in the log. Return ONLY valid SDL code.
+
+The following preamble is prepended to the code at render time (do not repeat it):
+""" + BASE_SCENE_TEMPLATE
+
+SYSTEM_PROMPT_PATCHER = r"""
+You are a POV-Ray Debugger. A previous fix did not resolve the render error.
+
+INPUTS:
+1. Diff of the previous fix attempt
+2. Numbered excerpt of the current code around the error
+3. Renderer error log
+
+Fix the error shown in the log. Return ONLY the corrected replacement for the
+excerpt's line range, as plain SDL without line numbers. Do not return any code
+outside the excerpt.
 """
 
 class RayLMConfig:
-    def __init__(self):
+    def __init__(self, require_api_key: bool = True):
         # 1. Load Zaguán credentials
         self.zaguan_api_key = os.getenv("ZAGUAN_API_KEY")
         self.zaguan_base_url = os.getenv("ZAGUAN_BASE_URL")
 
         # 2. Verify Credentials
-        if not self.zaguan_api_key:
+        if not self.zaguan_api_key and require_api_key:
             print("\n" + "!"*60)
             print(" ERROR: Zaguán API key not found in environment variables.")
             print(" Please set ZAGUAN_API_KEY.")
@@ -220,85 +283,275 @@ class RayLMConfig:
 
         # 4. Processing Defaults
         self.max_retries = 3
+        self.max_concurrency = 4
         self.output_dir = Path("output")
         self.scenes_dir = self.output_dir / "scenes"
         self.temp_dir = Path(tempfile.gettempdir()) / "raylm"
 
+        # Exact-match LLM response cache (opt-in: RAYLM_CACHE=1)
+        self.cache_enabled = os.getenv("RAYLM_CACHE") == "1"
+        self.cache_dir = self.output_dir / ".llm_cache"
+
         # Rendering Defaults
         self.width = 800
         self.height = 600
         self.fps = 24
         self.quality = 9
         self.timeout = None
+        self.render_workers = os.cpu_count() or 4
+
+        # Echo LLM tokens to the terminal as they stream in
+        self.verbose = False
 
         # Create Directories
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.scenes_dir.mkdir(parents=True, exist_ok=True)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        if self.cache_enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+def _discard_dir(path: Path):
+    """
+    Renames a directory out of the way (one metadata op) and deletes it on a
+    background thread, so per-file unlinks stay off the critical path.
+
+    The thread is a daemon so it never holds up exit; anything it leaves
+    behind is swept up by the next call for the same directory.
+    """
+    trash = path.with_name(f"{path.name}.old.{os.getpid()}.{time.monotonic_ns()}")
+    try:
+        path.rename(trash)
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    stale = list(path.parent.glob(f"{path.name}.old.*"))
+
+    def _remove():
+        for p in stale:
+            shutil.rmtree(p, ignore_errors=True)
+
+    threading.Thread(target=_remove, daemon=True).start()
 
 class LLMClient:
     def __init__(self, config: RayLMConfig):
         self.config = config
+        self._client = None
+        self._async_client = None
+
+        # System messages are built once and shared by every request
+        self._sys_msg_gen = {"role": "system", "content": SYSTEM_PROMPT_GEN}
+        self._sys_msg_ver = {"role": "system", "content": SYSTEM_PROMPT_VERIFIER}
+        self._sys_msg_fix = {"role": "system", "content": SYSTEM_PROMPT_FIXER}
+        self._sys_msg_patch = {"role": "system", "content": SYSTEM_PROMPT_PATCHER}
+
+    @staticmethod
+    def _pool_options(httpx) -> dict:
+        return {
+            "limits": httpx.Limits(max_keepalive_connections=8, max_connections=16),
+            "timeout": httpx.Timeout(600.0, connect=10.0),
+        }
+
+    def _get_client(self):
+        """
+        Returns the shared OpenAI client, creating it on first use so that the
+        keep-alive connection pool is reused across generate/verify/fix calls.
+        """
+        if self._client is None:
+            try:
+                import httpx
+                from openai import OpenAI
+            except ImportError:
+                raise ImportError("OpenAI module not found. Run: pip install openai")
+
+            # We use the standard OpenAI client, but point it to Zaguán's Base URL
+            self._client = OpenAI(
+                api_key=self.config.zaguan_api_key,
+                base_url=self.config.zaguan_base_url,
+                http_client=httpx.Client(**self._pool_options(httpx))
+            )
+        return self._client
+
+    def _get_async_client(self):
+        """
+        Async twin of _get_client(). Must be used (and closed via aclose())
+        inside a single event loop.
+        """
+        if self._async_client is None:
+            try:
+                import httpx
+                from openai import AsyncOpenAI
+            except ImportError:
+                raise ImportError("OpenAI module not found. Run: pip install openai")
+
+            self._async_client = AsyncOpenAI(
+                api_key=self.config.zaguan_api_key,
+                base_url=self.config.zaguan_base_url,
+                http_client=httpx.AsyncClient(**self._pool_options(httpx))
+            )
+        return self._async_client
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
 
     def generate_draft(self, user_request: str) -> str:
-        return self._call_zaguan(SYSTEM_PROMPT_GEN, user_request, self.config.model_gen)
+        return self._call_zaguan(self._sys_msg_gen, user_request, self.config.model_gen, TEMPERATURE_GEN)
 
     def verify_draft(self, user_request: str, draft_code: str) -> str:
-        verification_payload = f"""
+        verification_payload = self._verification_payload(user_request, draft_code)
+        return self._call_zaguan(self._sys_msg_ver, verification_payload, self.config.model_ver, TEMPERATURE_VER)
+
+    async def agenerate_draft(self, user_request: str) -> str:
+        return await self._acall_zaguan(self._sys_msg_gen, user_request, self.config.model_gen, TEMPERATURE_GEN)
+
+    async def averify_draft(self, user_request: str, draft_code: str) -> str:
+        verification_payload = self._verification_payload(user_request, draft_code)
+        return await self._acall_zaguan(self._sys_msg_ver, verification_payload, self.config.model_ver, TEMPERATURE_VER)
+
+    def _verification_payload(self, user_request: str, draft_code: str) -> str:
+        return f"""
 ### 1. USER REQUEST
 {user_request}
 
 ### 2. DRAFT CODE
 {draft_code}
+"""
 
-Review the code. Fix syntax errors. Ensure compliance with POV-Ray 3.7 standards.
-Return FINAL CODE only.
+    def fix_runtime_error(self, code: str, error: str, context_mode: str = "full",
+                          prev_code: Optional[str] = None, err_line: Optional[int] = None) -> str:
+        """
+        context_mode='full' sends the whole failed code. context_mode='diff' sends
+        only the previous fix as a diff plus the lines around err_line, and splices
+        the returned replacement back into the code.
+        """
+        if context_mode == "full" or prev_code is None or err_line is None:
+            fix_prompt = f"""
+### 1. FAILED CODE
+{code}
+
+### 2. RENDERER ERROR
+{error}
 """
-        return self._call_zaguan(SYSTEM_PROMPT_VERIFIER, verification_payload, self.config.model_ver)
+            return self._call_zaguan(self._sys_msg_fix, fix_prompt, self.config.model_ver, TEMPERATURE_VER)
 
-    def fix_runtime_error(self, code: str, error: str) -> str:
+        lines = code.splitlines()
+        lo = max(0, err_line - 1 - FIX_WINDOW)
+        hi = min(len(lines), err_line + FIX_WINDOW)
+        diff = "\n".join(difflib.unified_diff(prev_code.splitlines(), lines, lineterm="", n=3))
+        excerpt = "\n".join(f"{n}: {line}" for n, line in enumerate(lines[lo:hi], start=lo + 1))
         fix_prompt = f"""
-### RENDERER ERROR
-{error}
+### 1. PREVIOUS FIX (unified diff)
+{diff or "(no changes)"}
 
-### FAILED CODE
-{code}
+### 2. CURRENT CODE, LINES {lo + 1}-{hi}
+{excerpt}
 
-Fix the syntax error shown in the log. Return ONLY valid SDL code.
+### 3. RENDERER ERROR
+{error}
 """
-        return self._call_zaguan("You are a POV-Ray Debugger.", fix_prompt, self.config.model_ver)
+        patch = self._call_zaguan(self._sys_msg_patch, fix_prompt, self.config.model_ver, TEMPERATURE_VER)
+        return "\n".join(lines[:lo] + patch.splitlines() + lines[hi:])
 
-    def _call_zaguan(self, system_prompt: str, user_prompt: str, model: str) -> str:
+    def _call_zaguan(self, sys_msg: dict, user_prompt: str, model: str, temperature: float) -> str:
         """
         Unified call to Zaguán Gateway using standard OpenAI Client.
         """
-        try:
-            from openai import OpenAI
-        except ImportError:
-            raise ImportError("OpenAI module not found. Run: pip install openai")
+        key = self._cache_key(sys_msg["content"], user_prompt, model, temperature)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        client = self._get_client()
 
         try:
-            # We use the standard OpenAI client, but point it to Zaguán's Base URL
-            client = OpenAI(
-                api_key=self.config.zaguan_api_key,
-                base_url=self.config.zaguan_base_url
+            stream = client.chat.completions.create(
+                model=model,
+                messages=[sys_msg, {"role": "user", "content": user_prompt}],
+                temperature=temperature,
+                stream=True
             )
-            response = client.chat.completions.create(
+            parts = []
+            for chunk in stream:
+                self._consume_chunk(chunk, parts)
+            code = self._clean_code("".join(parts))
+        except Exception as e:
+            raise RuntimeError(f"Zaguán API Error: {str(e)}")
+
+        self._cache_put(key, code)
+        return code
+
+    async def _acall_zaguan(self, sys_msg: dict, user_prompt: str, model: str, temperature: float) -> str:
+        """
+        Same as _call_zaguan(), but awaitable so several requests can be in flight.
+        """
+        key = self._cache_key(sys_msg["content"], user_prompt, model, temperature)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        client = self._get_async_client()
+
+        try:
+            stream = await client.chat.completions.create(
                 model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7
+                messages=[sys_msg, {"role": "user", "content": user_prompt}],
+                temperature=temperature,
+                stream=True
             )
-            return self._clean_code(response.choices[0].message.content)
+            parts = []
+            async for chunk in stream:
+                self._consume_chunk(chunk, parts)
+            code = self._clean_code("".join(parts))
         except Exception as e:
             raise RuntimeError(f"Zaguán API Error: {str(e)}")
 
+        self._cache_put(key, code)
+        return code
+
+    def _consume_chunk(self, chunk, parts: List[str]):
+        if not chunk.choices:
+            return
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            if self.config.verbose:
+                sys.stdout.write(delta)
+                sys.stdout.flush()
+
+    def _cache_key(self, system_prompt: str, user_prompt: str, model: str, temperature: float) -> str:
+        payload = json.dumps(
+            {"m": model, "s": system_prompt, "u": user_prompt, "t": temperature},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        if not self.config.cache_enabled:
+            return None
+        try:
+            return (self.config.cache_dir / f"{key}.txt").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _cache_put(self, key: str, code: str):
+        if not self.config.cache_enabled or not code:
+            return
+        # Write to a private temp file first so a concurrent reader never sees half a response
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.config.cache_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(code)
+        os.replace(tmp, self.config.cache_dir / f"{key}.txt")
+
     def _clean_code(self, code: str) -> str:
         if not code: return ""
-        code = re.sub(r'^```(?:povray|pov)?\s*\n', '', code, flags=re.MULTILINE)
-        code = re.sub(r'\n```\s*$', '', code, flags=re.MULTILINE)
+        if '```' in code:
+            code = _FENCE_CLOSE.sub('', _FENCE_OPEN.sub('', code))
         return code.strip()
 
 class POVRayRenderer:
@@ -322,7 +575,7 @@ class POVRayRenderer:
 
     def render_animation(self, scene_file: Path, output_dir: Path, num_frames: int) -> Tuple[bool, Optional[str]]:
         if output_dir.exists():
-            shutil.rmtree(output_dir)
+            _discard_dir(output_dir)
         output_dir.mkdir(exist_ok=True)
 
         cmd = [
@@ -335,48 +588,160 @@ class POVRayRenderer:
             "+FN", "-D",
             f"+KFF{num_frames}", "+KI0.0", "+KF1.0"
         ]
-        return self._run_povray(cmd, cwd=scene_file.parent)
 
-    def _run_povray(self, cmd: List[str], cwd: Path) -> Tuple[bool, Optional[str]]:
+        # Split the frame range across several povray processes. Frame numbers
+        # (and therefore output names) stay global, so the chunks never collide.
+        workers = max(1, min(num_frames, self.config.render_workers))
+        if workers == 1:
+            return self._run_povray(cmd, cwd=scene_file.parent)
+
+        threads = max(1, (os.cpu_count() or workers) // workers)
+        per_worker, remainder = divmod(num_frames, workers)
+        commands = []
+        start = 1
+        for w in range(workers):
+            end = start + per_worker - 1 + (1 if w < remainder else 0)
+            commands.append(cmd + [f"+SF{start}", f"+EF{end}", f"+WT{threads}"])
+            start = end + 1
+
+        # Each worker only waits on its own subprocess, so threads are enough here
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda c: self._run_povray(c, cwd=scene_file.parent), commands))
+
+        errors = [error for ok, error in results if not ok]
+        if errors:
+            return False, errors[0]
+        return True, None
+
+    def parse_check(self, scene_file: Path, timeout: float = 5.0) -> bool:
+        """Parses the scene and traces a single pixel without writing any output."""
+        cmd = [
+            "povray",
+            f"+I{scene_file}",
+            "+W1", "+H1", "+Q0",
+            "-F", "-D"
+        ]
         try:
             result = subprocess.run(
                 cmd,
                 capture_output=True,
+                timeout=timeout,
+                cwd=scene_file.parent
+            )
+            return result.returncode == 0
+        except Exception:
+            return False
+
+    def _run_povray(self, cmd: List[str], cwd: Path) -> Tuple[bool, Optional[str]]:
+        """
+        Runs POV-Ray while streaming its log. Only the last lines are kept, and
+        the process is stopped as soon as a parse error has been reported.
+        """
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                timeout=self.config.timeout,
+                errors="replace",
                 cwd=cwd
             )
-            if result.returncode == 0:
-                return True, None
-            else:
-                return False, result.stderr + "\n" + result.stdout
-        except subprocess.TimeoutExpired:
-            return False, "Rendering timed out."
         except Exception as e:
             return False, str(e)
 
+        timed_out = threading.Event()
+
+        def _on_timeout():
+            timed_out.set()
+            proc.kill()
+
+        timer = None
+        if self.config.timeout:
+            timer = threading.Timer(self.config.timeout, _on_timeout)
+            timer.start()
+
+        tail = deque(maxlen=200)
+        lines_after_error = None
+        try:
+            for line in proc.stdout:
+                tail.append(line.rstrip("\n"))
+                if lines_after_error is None:
+                    if "Parse Error" in line:
+                        lines_after_error = 0
+                else:
+                    # Keep a few lines of context, then stop waiting for the process
+                    lines_after_error += 1
+                    if lines_after_error >= 10:
+                        proc.kill()
+                        break
+            proc.wait()
+        finally:
+            if timer:
+                timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+
+        if timed_out.is_set():
+            return False, "Rendering timed out."
+        if proc.returncode == 0 and lines_after_error is None:
+            return True, None
+        return False, "\n".join(tail)
+
+# Hardware H.264 encoders in order of preference, with their tuning flags
+HW_ENCODERS = [
+    ("h264_nvenc",        ["-preset", "p4", "-tune", "hq"]),
+    ("h264_videotoolbox", ["-q:v", "50"]),
+    ("h264_qsv",          []),
+]
+
 class VideoStitcher:
+    def __init__(self):
+        self._encoder = None
+
     def check_installed(self) -> bool:
         return shutil.which("ffmpeg") is not None
 
-    def normalize_frames(self, frames_dir: Path) -> bool:
-        files = sorted(list(frames_dir.glob("*.png")))
-        if not files: return False
-
-        for i, file_path in enumerate(files):
-            new_name = frames_dir / f"img_{i+1:04d}.png"
-            file_path.rename(new_name)
-        return True
+    def _detect_encoder(self) -> Tuple[str, List[str]]:
+        """Probes `ffmpeg -encoders` once and picks the best available H.264 encoder."""
+        if self._encoder is None:
+            self._encoder = ("libx264", [])
+            try:
+                result = subprocess.run(
+                    ["ffmpeg", "-hide_banner", "-encoders"],
+                    capture_output=True, text=True, timeout=10
+                )
+                listed = set(result.stdout.split())
+                for name, flags in HW_ENCODERS:
+                    if name in listed:
+                        self._encoder = (name, flags)
+                        break
+            except Exception:
+                pass
+        return self._encoder
 
     def stitch(self, frames_dir: Path, output_file: Path, fps: int) -> Tuple[bool, Optional[str]]:
-        if not self.normalize_frames(frames_dir):
+        if next(frames_dir.glob("raw_*.png"), None) is None:
             return False, "No frames found."
 
-        input_pattern = frames_dir / "img_%04d.png"
+        encoder, flags = self._detect_encoder()
+        success, error = self._encode(frames_dir, output_file, fps, encoder, flags)
+        if not success and encoder != "libx264":
+            # Listed is not the same as usable (e.g. no GPU present): retry in software
+            self._encoder = ("libx264", [])
+            success, error = self._encode(frames_dir, output_file, fps, "libx264", [])
+        return success, error
+
+    def _encode(self, frames_dir: Path, output_file: Path, fps: int,
+                encoder: str, flags: List[str]) -> Tuple[bool, Optional[str]]:
+        # POV-Ray zero-pads frame numbers, so a glob sorts them correctly as-is
+        input_pattern = frames_dir / "raw_*.png"
         cmd = [
             "ffmpeg", "-y", "-framerate", str(fps),
+            "-pattern_type", "glob",
             "-i", str(input_pattern),
-            "-c:v", "libx264", "-pix_fmt", "yuv420p",
+            "-c:v", encoder, *flags, "-pix_fmt", "yuv420p",
             str(output_file)
         ]
 
@@ -388,48 +753,155 @@ class VideoStitcher:
             return False, str(e)
 
 class RayLM:
-    def __init__(self, config: RayLMConfig):
+    def __init__(self, config: RayLMConfig, use_llm: bool = True):
         self.config = config
-        self.llm = LLMClient(config)
+        self.llm = LLMClient(config) if use_llm else None
         self.renderer = POVRayRenderer(config)
         self.stitcher = VideoStitcher()
+        self._base_include = None
 
     def _save_history_file(self, code: str) -> Path:
         """Saves a standalone .pov file to the history directory."""
+        from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"scene_{timestamp}.pov"
         filepath = self.config.scenes_dir / filename
 
-        with open(filepath, 'w') as f:
-            f.write(BASE_SCENE_TEMPLATE)
-            f.write("\n// --- AI Generated Content Below ---\n")
-            f.write(code)
+        # Batched prompts can finish within the same second; never overwrite a sibling
+        n = 1
+        while True:
+            try:
+                f = open(filepath, 'xb')
+                break
+            except FileExistsError:
+                n += 1
+                filepath = self.config.scenes_dir / f"scene_{timestamp}_{n}.pov"
+
+        with f:
+            f.write(_HISTORY_HEADER)
+            f.write(code.encode("utf-8"))
         return filepath
 
-    def _create_temp_scene(self, code: str) -> Path:
-        """Creates a temp file for the render/repair loop (includes template)"""
-        scene_file = self.config.temp_dir / "scene.pov"
-        with open(scene_file, 'w') as f:
-            f.write(BASE_SCENE_TEMPLATE)
-            f.write("\n// --- AI Generated Content Below ---\n")
-            f.write(code)
+    def _get_base_include(self) -> Path:
+        """Writes BASE_SCENE_TEMPLATE and the static scene.pov to the temp dir once per process."""
+        if self._base_include is None:
+            base_file = self.config.temp_dir / BASE_INCLUDE_NAME
+            with open(base_file, 'wb') as f:
+                f.write(_TEMPLATE_BYTES)
+            with open(self.config.temp_dir / SCENE_NAME, 'wb') as f:
+                f.write(_SCENE_BYTES)
+            self._base_include = base_file
+        return self._base_include
+
+    def _create_temp_scene(self, code: str, scene_file: Optional[Path] = None) -> Path:
+        """
+        Prepares a scene for the render/repair loop. By default only ai_body.pov
+        is rewritten and the static scene.pov is returned; an explicit scene_file
+        gets a self-contained scene (#include of the template plus the code).
+        """
+        self._get_base_include()
+        if scene_file is None:
+            with open(self.config.temp_dir / AI_BODY_NAME, 'wb') as f:
+                f.write(code.encode("utf-8"))
+            return self.config.temp_dir / SCENE_NAME
+        with open(scene_file, 'wb') as f:
+            f.write(_TEMP_HEADER)
+            f.write(code.encode("utf-8"))
         return scene_file
 
+    def _quick_syntax_ok(self, code: str) -> bool:
+        """True if the draft looks complete and POV-Ray parses it without errors."""
+        if code.count('{') != code.count('}'):
+            return False
+        if not _CAMERA_BLOCK.search(code) or not _LIGHT_BLOCK.search(code):
+            return False
+
+        fd, tmp = tempfile.mkstemp(prefix="check_", suffix=".pov", dir=self.config.temp_dir)
+        os.close(fd)
+        try:
+            return self.renderer.parse_check(self._create_temp_scene(code, Path(tmp)))
+        finally:
+            os.unlink(tmp)
+
+    def _generate_scenes(self, prompts: List[str]) -> List[Union[Tuple[str, Path], BaseException]]:
+        """Runs the generate -> verify -> save pipeline for every prompt concurrently.
+
+        A prompt that fails yields its exception in place of the result, so one
+        bad prompt does not discard the scenes of the others.
+        """
+        self._get_base_include()  # before any worker thread needs it
+        return asyncio.run(self._pipeline_many(prompts))
+
+    async def _pipeline_many(self, prompts: List[str]) -> List[Union[Tuple[str, Path], BaseException]]:
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        try:
+            return await asyncio.gather(*(self._pipeline(p, semaphore) for p in prompts),
+                                        return_exceptions=True)
+        finally:
+            await self.llm.aclose()
+
+    async def _pipeline(self, prompt: str, semaphore: asyncio.Semaphore) -> Tuple[str, Path]:
+        async with semaphore:
+            # 1. GENERATE
+            print("\n⚙  Generating SDL Code...")
+            draft_code = await self.llm.agenerate_draft(prompt)
+
+            # 2. VERIFY (skipped when the draft already parses)
+            loop = asyncio.get_running_loop()
+            if await loop.run_in_executor(None, self._quick_syntax_ok, draft_code):
+                print("\n✅ Draft parses cleanly, skipping verifier.")
+                code = draft_code
+            else:
+                print("\n🔍 Verifying Syntax & Compliance...")
+                code = await self.llm.averify_draft(prompt, draft_code)
+
+        # 3. SAVE HISTORY (off the event loop, so other prompts keep talking to the gateway)
+        saved_path = await loop.run_in_executor(None, self._save_history_file, code)
+        return code, saved_path
+
+    def _render_hash(self, scene_file: Path) -> str:
+        """Hash of everything that determines the rendered image."""
+        h = hashlib.sha1(scene_file.read_bytes())
+        if scene_file == self.config.temp_dir / SCENE_NAME:
+            h.update((self.config.temp_dir / AI_BODY_NAME).read_bytes())
+        h.update(_TEMPLATE_BYTES)
+        h.update(f"{self.config.width}x{self.config.height}@{self.config.quality}".encode())
+        return h.hexdigest()[:12]
+
+    def _error_line(self, error: str) -> Optional[int]:
+        """Maps the POV-Ray error location to a line in the AI code, if it points there."""
+        m = _ERROR_LOCATION.search(error)
+        if not m:
+            return None
+        name = Path(m.group(1)).name
+        if name == AI_BODY_NAME:
+            return int(m.group(2))
+        if name in (BASE_INCLUDE_NAME, SCENE_NAME):
+            return None
+        line = int(m.group(2)) - _TEMP_HEADER.count(b"\n")
+        return line if line > 0 else None
+
     def _extract_relevant_error(self, full_log: str) -> str:
-        lines = full_log.splitlines()
+        # One pass that stops once the error context is captured. Memory is bounded by
+        # the log itself, which _run_povray already limits to its last 200 lines
+        tail = deque(maxlen=20)
         relevant = []
         capture = False
-        for line in lines:
+        for line in io.StringIO(full_log, newline=None):
+            line = line.rstrip("\n")
+            tail.append(line)
             if "Parse Error" in line or "Fatal error" in line:
                 relevant.append(line)
                 capture = True
             elif "Parse Warning" in line:
                 continue
-            elif capture and len(relevant) < 10:
+            elif capture:
                 relevant.append(line)
-        return "\n".join(relevant) if relevant else "\n".join(lines[-20:])
+                if len(relevant) >= 10:
+                    break
+        return "\n".join(relevant) if relevant else "\n".join(tail)
 
-    def run(self, full_prompt: str, animate: bool, duration: float, no_render: bool, render_file: str):
+    def run(self, prompts: List[str], animate: bool, duration: float, no_render: bool, render_file: str):
         if not self.renderer.check_installed():
             print("ERROR: 'povray' not found.")
             return
@@ -446,9 +918,6 @@ class RayLM:
         print("=" * 60)
 
         # --- PATH SELECTION ---
-        scene_path_to_render = None
-        current_code = None
-
         if render_file:
             # ➡ DIRECT RENDER MODE
             print(f"\n📁 Mode: Render Existing File")
@@ -456,36 +925,51 @@ class RayLM:
             if not p.exists():
                 print(f"ERROR: File not found: {render_file}")
                 return
-            scene_path_to_render = p
-            print(f"   Target: {scene_path_to_render}")
+            print(f"   Target: {p}")
+            self._render_with_repair(p, None, animate, duration)
 
         else:
             # ➡ GENERATION MODE
             print(f"\n🧠 Mode: Zaguán Generation")
             print(f"   - Gen: {self.config.model_gen}")
             print(f"   - Ver: {self.config.model_ver}")
-
-            # 1. GENERATE
-            print("\n⚙  Generating SDL Code...")
-            draft_code = self.llm.generate_draft(full_prompt)
-
-            # 2. VERIFY
-            print("\n🔍 Verifying Syntax & Compliance...")
-            current_code = self.llm.verify_draft(full_prompt, draft_code)
-
-            # 3. SAVE HISTORY
-            saved_path = self._save_history_file(current_code)
-            print(f"\n💾 Saved to History: {saved_path}")
+            if len(prompts) > 1:
+                print(f"   - Batch: {len(prompts)} prompts")
+
+            # 1-3. GENERATE, VERIFY & SAVE HISTORY
+            scenes = []
+            for i, result in enumerate(self._generate_scenes(prompts)):
+                if isinstance(result, BaseException):
+                    print(f"\n❌ Prompt {i + 1}/{len(prompts)} failed: {result}")
+                    continue
+                current_code, saved_path = result
+                print(f"\n💾 Saved to History: {saved_path}")
+                scenes.append((i, current_code))
+
+            if not scenes:
+                print("\nERROR: No scene could be generated.")
+                return
+            if len(scenes) < len(prompts):
+                print(f"\n⚠  {len(prompts) - len(scenes)} of {len(prompts)} prompts failed.")
 
             if no_render:
                 print("\n✨ Code Generation Complete. Exiting.")
                 return
 
-            # Prepare for rendering loop
-            scene_path_to_render = self._create_temp_scene(current_code)
-
+            for i, current_code in scenes:
+                tag = ""
+                if len(prompts) > 1:
+                    print(f"\n📦 Scene {i + 1}/{len(prompts)}")
+                    tag = f"_{i + 1}"
+                # Prepare for rendering loop
+                scene_path_to_render = self._create_temp_scene(current_code)
+                self._render_with_repair(scene_path_to_render, current_code, animate, duration, tag)
+
+    def _render_with_repair(self, scene_path_to_render: Path, current_code: Optional[str],
+                            animate: bool, duration: float, tag: str = ""):
         # --- RENDER LOOP ---
         can_auto_repair = (current_code is not None)
+        prev_code = None
 
         for attempt in range(self.config.max_retries):
             print(f"\n🎬 Render Attempt {attempt + 1}")
@@ -508,20 +992,33 @@ class RayLM:
 
                 if success:
                     print("   Stitching Video...")
-                    out_vid = self.config.output_dir / f"anim_{int(time.time())}.mp4"
+                    out_vid = self.config.output_dir / f"anim_{int(time.time())}{tag}.mp4"
                     vid_success, vid_err = self.stitcher.stitch(frames_dir, out_vid, self.config.fps)
                     if vid_success: output_path = out_vid
                     else:
                         success = False
                         error = f"Stitching: {vid_err}"
                         is_syntax = False
-                    if frames_dir.exists(): shutil.rmtree(frames_dir, ignore_errors=True)
+                    if frames_dir.exists(): _discard_dir(frames_dir)
             else:
-                print("   Rendering Image...")
-                print("   (Press Ctrl+C to abort if stuck)")
-                out_img = self.config.output_dir / f"render_{int(time.time())}.png"
-                success, error = self.renderer.render_image(scene_path_to_render, out_img)
-                if success: output_path = out_img
+                # Renders are content-addressed, so an identical scene is never traced twice
+                out_img = self.config.output_dir / f"render_{self._render_hash(scene_path_to_render)}.png"
+                if out_img.exists():
+                    print("   ✅ (cache hit)")
+                    success, output_path = True, out_img
+                else:
+                    print("   Rendering Image...")
+                    print("   (Press Ctrl+C to abort if stuck)")
+                    # POV-Ray leaves a partial image on Ctrl+C or error; only a finished
+                    # render is moved onto the cache name
+                    tmp_img = out_img.with_name(f"{out_img.stem}.{os.getpid()}.partial.png")
+                    try:
+                        success, error = self.renderer.render_image(scene_path_to_render, tmp_img)
+                        if success:
+                            os.replace(tmp_img, out_img)
+                            output_path = out_img
+                    finally:
+                        tmp_img.unlink(missing_ok=True)
 
             if success:
                 print(f"\n✅ Output: {output_path}")
@@ -537,7 +1034,11 @@ class RayLM:
 
                 if can_auto_repair and attempt < self.config.max_retries - 1:
                     print("   🚑 Auto-repairing via Zaguán...")
-                    current_code = self.llm.fix_runtime_error(current_code, clean_error)
+                    # After the first repair, send only the last diff and the lines around the error
+                    err_line = self._error_line(clean_error)
+                    mode = "diff" if prev_code is not None and err_line else "full"
+                    prev_code, current_code = current_code, self.llm.fix_runtime_error(
+                        current_code, clean_error, mode, prev_code, err_line)
                 else:
                     if not can_auto_repair:
                         print("   (Auto-repair unavailable in --render mode)")
@@ -548,6 +1049,7 @@ def main():
     parser = argparse.ArgumentParser(description="rayLM: Zaguán AI POV-Ray Generator")
     parser.add_argument("prompt", nargs="?", help="Scene description")
     parser.add_argument("--file", "-f", help="Load prompt from file")
+    parser.add_argument("--batch-delim", help="Split --file into several prompts on lines consisting only of this delimiter (e.g. ---)")
 
     parser.add_argument("--no-render", action="store_true", help="Generate and save only (no render)")
     parser.add_argument("--render", help="Render an existing .pov file (skips AI)")
@@ -563,29 +1065,51 @@ def main():
     parser.add_argument("--timeout", type=int, help="Render timeout in seconds (Default: Infinite)")
 
     parser.add_argument("--model", help="Override models")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Stream LLM output to the terminal")
 
     args = parser.parse_args()
 
+    # Try to load .env from the working directory, then from next to this script;
+    # values already set win, so the first file found takes precedence
+    candidates = dict.fromkeys((Path.cwd() / ".env", Path(__file__).resolve().parent / ".env"))
+    env_files = [f for f in candidates if f.is_file()]
+    if env_files:
+        try:
+            from dotenv import load_dotenv
+            for env_file in env_files:
+                load_dotenv(env_file)
+        except ImportError:
+            pass
+
     # Validation
     if args.render:
-        final_prompt = ""
+        prompts = []
     else:
-        full_prompt_parts = []
+        file_prompts = []
         if args.file:
             try:
                 with open(args.file, 'r', encoding='utf-8') as f:
                     c = f.read().strip()
-                    if c: full_prompt_parts.append(c)
+                    if args.batch_delim:
+                        # Only a line holding nothing but the delimiter separates prompts
+                        delim_line = re.compile(rf'^{re.escape(args.batch_delim)}\s*$', re.M)
+                        file_prompts = [p.strip() for p in delim_line.split(c) if p.strip()]
+                    elif c:
+                        file_prompts = [c]
             except Exception as e:
                 print(f"File Error: {e}")
                 sys.exit(1)
-        if args.prompt: full_prompt_parts.append(args.prompt)
 
-        if not full_prompt_parts:
+        # A positional prompt is appended to every prompt from the file
+        if file_prompts:
+            prompts = ["\n".join([fp] + ([args.prompt] if args.prompt else [])) for fp in file_prompts]
+        elif args.prompt:
+            prompts = [args.prompt]
+        else:
             parser.error("You must provide PROMPT/--file OR use --render.")
-        final_prompt = "\n".join(full_prompt_parts)
 
-    config = RayLMConfig()
+    # --render never talks to the gateway, so it needs neither a key nor the LLM client
+    config = RayLMConfig(require_api_key=not args.render)
     if args.model:
         config.model_gen = args.model
         config.model_ver = args.model
@@ -603,14 +1127,17 @@ def main():
 
     config.fps = args.fps
     config.timeout = args.timeout
+    config.verbose = args.verbose
 
-    app = RayLM(config)
+    app = RayLM(config, use_llm=not args.render)
     try:
-        app.run(final_prompt, args.animate, args.duration, args.no_render, args.render)
+        app.run(prompts, args.animate, args.duration, args.no_render, args.render)
     except KeyboardInterrupt:
         print("\nAborted.")
     except Exception as e:
         print(f"\nError: {e}")
+    finally:
+        if app.llm: app.llm.close()
 
 if __name__ == "__main__":
     main()
@@ -20,29 +20,35 @@ import uuid
 import tempfile
 import argparse
 import json
+import hashlib
 from typing import Tuple, Optional, List, Dict, Any, Union
 import re
+import string
 import shutil
 import logging
 import signal
 from datetime import datetime
 from dataclasses import dataclass, field, asdict
-from contextlib import contextmanager
+from contextlib import contextmanager, redirect_stdout, redirect_stderr
+import errno
 import math
+import random
 import threading
-from functools import wraps
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import wraps, lru_cache
+from types import MappingProxyType
 
 try:
-    from openai import OpenAI, APIError, RateLimitError, Timeout
+    import ahocorasick  # Optional: pyahocorasick, for single-pass keyword scanning
 except ImportError:
-    print("Error: openai package is required. Install it with: pip install openai")
-    sys.exit(1)
+    ahocorasick = None
 
 try:
-    from dotenv import load_dotenv
+    import orjson  # Optional: faster JSON serialisation for metadata files
 except ImportError:
-    print("Warning: python-dotenv package not found. Environment variables may not be loaded properly.")
-    load_dotenv = lambda: None
+    orjson = None
 
 # Enhanced logging configuration
 def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
@@ -66,9 +72,9 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> lo
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
     
-    # File handler (if specified)
+    # File handler (if specified); the file is only opened once something is logged
     if log_file:
-        file_handler = logging.FileHandler(log_file)
+        file_handler = logging.FileHandler(log_file, delay=True)
         file_handler.setLevel(logging.DEBUG)  # Log everything to file
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
@@ -78,10 +84,134 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> lo
 # Initialize logging
 logger = setup_logging()
 
-load_dotenv()
+def _load_env() -> None:
+    """Load .env into the environment; imported lazily so --help stays fast."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        print("Warning: python-dotenv package not found. Environment variables may not be loaded properly.")
+        return
+    load_dotenv()
 
-# Enhanced configuration with dataclasses
-@dataclass
+# Precompiled regular expressions (compiled once at import, reused on every call)
+_SAFE_CHARS_RE = re.compile(r'[^\w\s-]')
+_DASH_SPACE_RE = re.compile(r'[-\s]+')
+_LINE_BREAK_RE = re.compile(rb'\r\n?|\n')
+_CLOCK_DECLARE_RE = re.compile(r'#declare\s+Clock\s*=\s*[^;]+;', re.IGNORECASE)
+_INCLUDE_NAME_RE = re.compile(r'^[\w.-]+\.inc$')
+_INCLUDE_DIRECTIVE_RE = re.compile(r'#include\s+"([^"]+)"')
+_CAMERA_LOC_RE = re.compile(r'camera\s*{[^}]*location\s*\(\s*[^)]*\)\s*}', re.IGNORECASE | re.DOTALL)
+_CAMERA_LOOK_RE = re.compile(r'camera\s*{[^}]*look_at\s*\(\s*[^)]*\)\s*}', re.IGNORECASE | re.DOTALL)
+_DANGEROUS_PATTERNS = ('exec(', 'eval(', 'system(', 'subprocess')
+_DANGEROUS_RE = re.compile('|'.join(re.escape(p) for p in _DANGEROUS_PATTERNS), re.IGNORECASE)
+_SYNTAX_PATTERNS = (
+    (_CAMERA_LOC_RE, "Camera location found"),
+    (_CAMERA_LOOK_RE, "Camera look_at found"),
+)
+
+# Named resolutions accepted by --resolution (read-only, built once at import)
+_RESOLUTION_PRESETS = MappingProxyType({
+    "480p": (854, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160)
+})
+
+# Keywords validate_scene_code looks for, found in a single case-insensitive pass
+_REQUIRED_INCLUDES = ('colors.inc', 'textures.inc', 'finish.inc')
+_INCLUDE_DIRECTIVES = tuple(f'#include "{inc}"' for inc in _REQUIRED_INCLUDES)
+_SCENE_KEYWORDS = _INCLUDE_DIRECTIVES + ('camera', 'light_source')
+
+# Fixed scene skeleton for template mode; the model only fills the slots
+# (camera/light_source take the statement bodies, objects takes full SDL)
+POVRAY_TEMPLATE = """{includes}
+
+camera {{
+{camera}
+}}
+
+light_source {{
+{light_source}
+}}
+
+{objects}
+"""
+
+if ahocorasick is not None:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _SCENE_KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _KEYWORD_AUTOMATON.make_automaton()
+else:
+    _KEYWORD_AUTOMATON = None
+    _KEYWORD_RE = re.compile('|'.join(re.escape(k) for k in _SCENE_KEYWORDS), re.IGNORECASE)
+
+def _find_scene_keywords(scene_code: str) -> set:
+    """Return the subset of _SCENE_KEYWORDS present in scene_code (case-insensitive)."""
+    seen = set()
+    if _KEYWORD_AUTOMATON is not None:
+        for _, keyword in _KEYWORD_AUTOMATON.iter(scene_code.lower()):
+            seen.add(keyword)
+            if len(seen) == len(_SCENE_KEYWORDS):
+                break
+    else:
+        for match in _KEYWORD_RE.finditer(scene_code):
+            seen.add(match.group(0).lower())
+            if len(seen) == len(_SCENE_KEYWORDS):
+                break
+    return seen
+
+# One translate pass: drop ASCII punctuation (except '-'/'_') and control characters,
+# and lowercase ASCII letters
+_FILENAME_TRANS = str.maketrans(
+    {**{c: None for c in string.punctuation if c not in '-_'},
+     **{chr(i): None for i in (*range(32), 127) if not chr(i).isspace()},
+     **{c: c.lower() for c in string.ascii_uppercase}}
+)
+
+def _safe_prompt_fragment(prompt: str) -> str:
+    """Turn a prompt into a short filename-safe fragment."""
+    safe = prompt.translate(_FILENAME_TRANS)
+    if not safe.isascii():
+        # Non-ASCII text needs Unicode-aware \w and lower()
+        safe = _SAFE_CHARS_RE.sub('', safe.lower())
+    return _DASH_SPACE_RE.sub('_', safe)[:30].strip('_')
+
+@lru_cache(maxsize=8)
+def _prepare_clock_template(scene_code: str) -> Tuple[str, ...]:
+    """Split scene code around its Clock declaration site(s).
+    
+    Joining the pieces with '#declare Clock = <value>;' yields the scene for
+    that clock value, so the regex work runs once per scene instead of once
+    per frame. Results are cached (the pieces are an immutable tuple), so
+    repeated RayLM._inject_clock_value calls on the same scene only splice.
+    An existing declaration is replaced; otherwise one is inserted after the
+    includes.
+    """
+    pieces = _CLOCK_DECLARE_RE.split(scene_code)
+    if len(pieces) > 1:
+        return tuple(pieces)
+    
+    include_end = scene_code.find('\n\n')
+    if include_end == -1:
+        include_end = scene_code.find('\n')
+    if include_end != -1:
+        return (scene_code[:include_end] + '\n', scene_code[include_end:])
+    # Fallback: prepend clock declaration
+    return ('', '\n' + scene_code)
+
+def _count_braces(scene_code: str) -> Tuple[int, int]:
+    """Return (opening, closing) brace counts.
+    
+    str.count is a memchr-speed C scan, far cheaper than a Counter over every
+    character; callers compute this once and pass it to both the validator
+    and fix_common_issues.
+    """
+    return scene_code.count('{'), scene_code.count('}')
+
+# Enhanced configuration with dataclasses (frozen: settled once, then shared read-only)
+@dataclass(frozen=True)
 class RayLMConfig:
     """Enhanced configuration for RayLM application."""
     output_dir: Path = field(default_factory=lambda: Path("./output"))
@@ -97,6 +227,11 @@ class RayLMConfig:
     # Model Configuration
     generator_model: str = "zaguanai/gemini-3-pro-preview"
     verifier_model: str = "zaguanai/claude-sonnet-4.5-latest"
+    generator_temperature: float = 0.7  # 0 makes generation deterministic and cacheable
+    structured_output: bool = True  # Ask the generator for JSON matching SCENE_RESPONSE_FORMAT
+    template_mode: bool = False  # Model fills POVRAY_TEMPLATE slots instead of writing the whole scene
+    stream_responses: bool = True  # Consume completions as a stream instead of one blocking response
+    prompt_caching: bool = True  # Mark the verifier system prompt as cacheable (cache_control) for Claude models
     
     # Rendering Configuration
     default_width: int = 1920
@@ -107,11 +242,26 @@ class RayLMConfig:
     # Animation Configuration
     default_fps: int = 30
     default_duration: int = 5
+    render_workers: int = field(default_factory=lambda: os.cpu_count() or 4)  # Frames rendered at once
+    frame_memory_mb: int = 512  # Rough peak memory of one POV-Ray frame; caps render_workers to what fits
+    hw_encode: bool = False  # Prefer NVENC/VideoToolbox/VAAPI when FFmpeg provides them
+    stream_frames: bool = False  # Encode frames while rendering and delete each once encoded
+    max_pending_frames: int = 30  # Frames rendered or rendering but not yet encoded (stream_frames)
+    cluster_backend: Optional[str] = None  # "ray" spreads animation frames across a Ray cluster
+    cluster_address: str = "auto"  # Passed to ray.init
     
     # Performance Settings
     max_retries: int = 3
     retry_delay: float = 1.0
+    max_delay: float = 30.0  # Upper bound on a single retry backoff (seconds)
+    jitter: float = 0.5  # Backoff is scaled by a random factor in [1, 1 + jitter]
     api_timeout: float = 60.0
+    max_concurrency: int = 4  # Concurrent LLM requests in batch mode
+    batch_single_request: bool = False  # Send a whole batch as one chat completion
+    batch_poll_interval: float = 30.0  # Seconds between Batch API status checks
+    enable_cache: bool = True  # Reuse responses for identical temperature-0 requests
+    cache_generations: bool = False  # Reuse the final scene for a repeated prompt, at any temperature
+    scene_cache_dir: Path = field(default_factory=lambda: Path("~/.cache/raylm/scenes").expanduser())
     
     # Validation Settings
     validate_syntax: bool = True
@@ -162,6 +312,10 @@ class RayLMTimeoutError(RayLMError):
     """Timeout-related errors."""
     pass
 
+class RayLMCancelledError(RayLMError):
+    """Work stopped because the user cancelled the run."""
+    pass
+
 # Performance monitoring utilities
 @dataclass
 class PerformanceMetrics:
@@ -211,10 +365,10 @@ class ValidationSystem:
         if len(prompt.strip()) < 5:
             errors.append("Prompt must be at least 5 characters long")
         
-        # Check for potentially problematic content
-        dangerous_patterns = ['exec(', 'eval(', 'system(', 'subprocess']
-        for pattern in dangerous_patterns:
-            if pattern in prompt.lower():
+        # Check for potentially problematic content (case-insensitive, no lowered copy)
+        found = {match.group(0).lower() for match in _DANGEROUS_RE.finditer(prompt)}
+        for pattern in _DANGEROUS_PATTERNS:
+            if pattern in found:
                 errors.append(f"Prompt contains potentially dangerous pattern: {pattern}")
         
         # Check for language patterns that might confuse AI
@@ -224,7 +378,8 @@ class ValidationSystem:
         return len(errors) == 0, errors
     
     @staticmethod
-    def validate_scene_code(scene_code: str) -> Tuple[bool, List[str]]:
+    def validate_scene_code(scene_code: str,
+                            brace_counts: Optional[Tuple[int, int]] = None) -> Tuple[bool, List[str]]:
         """Comprehensive validation of POV-Ray scene code."""
         errors = []
         warnings = []
@@ -234,32 +389,29 @@ class ValidationSystem:
             return False, errors
         
         # Check for balanced braces
-        open_braces = scene_code.count('{')
-        close_braces = scene_code.count('}')
+        open_braces, close_braces = brace_counts or _count_braces(scene_code)
         if open_braces != close_braces:
             errors.append(f"Unbalanced braces: {open_braces} opening, {close_braces} closing")
         
+        seen = _find_scene_keywords(scene_code)
+        
         # Check for common POV-Ray includes
-        required_includes = ['colors.inc', 'textures.inc', 'finish.inc']
-        for include in required_includes:
-            if f'#include "{include}"' not in scene_code and f'#include "{include}"\n' not in scene_code:
+        for include, directive in zip(_REQUIRED_INCLUDES, _INCLUDE_DIRECTIVES):
+            if directive not in seen:
                 warnings.append(f"Scene code may be missing include: {include}")
         
         # Check for basic POV-Ray structure
-        if 'camera' not in scene_code.lower():
+        if 'camera' not in seen:
             warnings.append("No camera definition found in scene")
         
-        if 'light_source' not in scene_code.lower():
+        if 'light_source' not in seen:
             warnings.append("No light source definition found in scene")
         
-        # Check for common syntax issues
-        syntax_patterns = [
-            (r'camera\s*{[^}]*location\s*\(\s*[^)]*\)\s*}', "Camera location found"),
-            (r'camera\s*{[^}]*look_at\s*\(\s*[^)]*\)\s*}', "Camera look_at found"),
-        ]
-        
-        for pattern, description in syntax_patterns:
-            if not re.search(pattern, scene_code, re.IGNORECASE | re.DOTALL):
+        # Check for common syntax issues; both patterns need a camera block,
+        # so skip the regex scans when the keyword pass found none
+        has_camera = 'camera' in seen
+        for pattern, description in _SYNTAX_PATTERNS:
+            if not has_camera or not pattern.search(scene_code):
                 warnings.append(f"{description} may be incomplete")
         
         # Log warnings
@@ -268,6 +420,12 @@ class ValidationSystem:
         
         return len(errors) == 0, errors + warnings
     
+    @staticmethod
+    def has_required_structure(scene_code: str) -> bool:
+        """Check that the scene defines a camera and at least one light source."""
+        seen = _find_scene_keywords(scene_code)
+        return 'camera' in seen and 'light_source' in seen
+    
     @staticmethod
     def validate_resolution(width: int, height: int) -> Tuple[bool, List[str]]:
         """Validate render resolution."""
@@ -288,6 +446,12 @@ class ValidationSystem:
         
         return len(errors) == 0, errors
 
+def _dumps_indented(data: Any) -> bytes:
+    """Serialise data as indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
 # Enhanced file management
 class FileManager:
     """Advanced file and directory management."""
@@ -315,9 +479,7 @@ class FileManager:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Sanitize prompt for filename
-        safe_prompt = re.sub(r'[^\w\s-]', '', prompt.lower())
-        safe_prompt = re.sub(r'[-\s]+', '_', safe_prompt)
-        safe_prompt = safe_prompt[:30].strip('_')
+        safe_prompt = _safe_prompt_fragment(prompt)
         
         return self.config.output_dir / self.config.scene_dir / f"scene_{timestamp}_{safe_prompt}.pov"
     
@@ -328,16 +490,16 @@ class FileManager:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Sanitize prompt for filename
-        safe_prompt = re.sub(r'[^\w\s-]', '', prompt.lower())
-        safe_prompt = re.sub(r'[-\s]+', '_', safe_prompt)
-        safe_prompt = safe_prompt[:30].strip('_')
+        safe_prompt = _safe_prompt_fragment(prompt)
         
         return self.config.output_dir / self.config.render_dir / f"render_{timestamp}_{safe_prompt}.{extension}"
     
     def create_temp_filename(self, suffix: str = "", prefix: str = "raylm_") -> Path:
         """Create a temporary file in the temp directory."""
-        temp_file = tempfile.mktemp(suffix=suffix, prefix=prefix, dir=str(self.config.temp_dir))
-        return Path(temp_file)
+        # NamedTemporaryFile creates the file atomically (mktemp only picks a name)
+        with tempfile.NamedTemporaryFile(suffix=suffix, prefix=prefix,
+                                         dir=str(self.config.temp_dir), delete=False) as f:
+            return Path(f.name)
     
     def cleanup_temp_files(self, pattern: str = "raylm_*") -> None:
         """Clean up temporary files."""
@@ -359,8 +521,7 @@ class FileManager:
         
         try:
             backup_filename = filename.with_suffix('.backup.pov')
-            with open(backup_filename, 'w') as f:
-                f.write(scene_code)
+            backup_filename.write_bytes(scene_code.encode('utf-8'))
             logger.debug(f"Scene backup created: {backup_filename}")
             return backup_filename
         except Exception as e:
@@ -377,40 +538,17 @@ class FileManager:
                 'metrics': metrics.to_dict()
             }
             
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            metadata_file.write_bytes(_dumps_indented(metadata))
             
             logger.debug(f"Metadata saved: {metadata_file}")
         except Exception as e:
             logger.warning(f"Failed to save metadata: {e}")
 
-# Enhanced LLM client with retry logic
-class LLMClient:
-    """Enhanced LLM client with retry logic and error handling."""
-    
-    def __init__(self, config: RayLMConfig):
-        self.config = config
-        self._client = None
-        self._initialize_client()
-    
-    def _initialize_client(self) -> None:
-        """Initialize the OpenAI client."""
-        try:
-            client_config = {"api_key": self.config.api_key}
-            if self.config.base_url:
-                client_config["base_url"] = self.config.base_url
-            
-            self._client = OpenAI(**client_config)
-            logger.info("LLM client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize LLM client: {e}")
-            raise RayLMConfigurationError(f"Failed to initialize LLM client: {e}")
-    
-    def generate_scene_code(self, prompt: str, metrics: PerformanceMetrics) -> str:
-        """Generate POV-Ray scene code with retry logic."""
-        
-        # Enhanced system prompt for better code generation
-        system_prompt = """You are a professional POV-Ray scene generator with expertise in 3D graphics and rendering.
+# System prompts. These are plain constants (never f-strings) and are always
+# sent as the first message, with prompt-specific text only in the user
+# message, so every request starts with a byte-identical prefix that
+# providers can serve from their prompt cache.
+_GEN_SYSTEM_PROMPT = """You are a professional POV-Ray scene generator with expertise in 3D graphics and rendering.
 
 IMPORTANT REQUIREMENTS:
 1. Generate ONLY valid POV-Ray SDL code - no explanations, markdown, or additional text
@@ -421,6 +559,13 @@ IMPORTANT REQUIREMENTS:
 6. Ensure complete and syntactically correct code
 7. Use appropriate materials, textures, and lighting
 
+SELF-CHECK BEFORE ANSWERING (your output is rendered without further review):
+- All braces must be balanced
+- All statements must be properly terminated
+- Must include: colors.inc, textures.inc, finish.inc
+- Must have camera, light_source, and at least one object
+- No explanations or markdown fences around the code
+
 Example structure:
 ```
 #include "colors.inc"
@@ -448,43 +593,529 @@ object {
 }
 ```
 """
+
+_TEMPLATE_SYSTEM_PROMPT = """You are a professional POV-Ray scene generator with expertise in 3D graphics and rendering.
+
+The scene is assembled from a fixed template; you only provide the parts that vary:
+- camera: the statements inside camera { ... } (e.g. location <0, 2, -5> look_at <0, 1, 0>), without the camera keyword or braces
+- light_source: the statements inside light_source { ... } (e.g. <10, 10, -10> color White), without the keyword or braces
+- objects: complete POV-Ray SDL for every object in the scene, with materials and textures
+- includes: extra include files needed beyond colors.inc, textures.inc and finish.inc (e.g. "metals.inc")
+
+All braces must be balanced and all statements properly terminated. No explanations or markdown.
+"""
+
+_VER_SYSTEM_PROMPT = """You are an expert POV-Ray code reviewer and validator.
+
+Your task is to:
+1. Verify the syntax and completeness of POV-Ray code
+2. Fix any syntax errors, missing includes, or structural issues
+3. Ensure the code follows POV-Ray best practices
+4. Return ONLY the corrected POV-Ray code
+5. Do NOT add explanations, comments, or markdown
+
+CRITICAL REQUIREMENTS:
+- Must include: colors.inc, textures.inc, finish.inc
+- Must have camera, light_source, and at least one object
+- All braces must be balanced
+- All statements must be properly terminated
+- Use proper POV-Ray SDL syntax
+
+Return ONLY the corrected code, nothing else."""
+
+# Disk-backed response cache
+class LLMCache:
+    """Cache of LLM responses keyed on the full request, stored as JSON files."""
+    
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def scene_key(prompt: str, config: "RayLMConfig") -> str:
+        """Return the key for a finished (generated and verified) scene.
+        
+        The prompt is normalised first (case, whitespace, trailing
+        punctuation), so reruns that differ only in those still hit.
+        """
+        normalized = ' '.join(prompt.casefold().split()).rstrip('.!?,;: ')
+        payload = json.dumps([normalized, config.generator_model, config.verifier_model, config.template_mode])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def cache_key(model: str, system_prompt: str, user_prompt: str, temperature: float) -> Optional[str]:
+        """Return the cache key for a request, or None if the request is not deterministic."""
+        if temperature > 0:
+            return None
+        payload = json.dumps([model, system_prompt, user_prompt, temperature])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, if any."""
+        cache_file = self.cache_dir / f"{key}.json"
+        try:
+            return json.loads(cache_file.read_bytes())["content"]
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring corrupt cache entry {cache_file.name}: {e}")
+            return None
+    
+    def set(self, key: str, value: str) -> None:
+        """Store a response; written to a temp file first so readers never see partial JSON."""
+        cache_file = self.cache_dir / f"{key}.json"
+        temp_file = self.cache_dir / f".{uuid.uuid4().hex}.tmp"
+        try:
+            temp_file.write_bytes(json.dumps({"content": value}).encode("utf-8"))
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {cache_file.name}: {e}")
+            temp_file.unlink(missing_ok=True)
+
+def _prompt_token_usage(usage) -> Dict[str, int]:
+    """Prompt and cached-prefix token counts from a completion's usage block.
+
+    Anthropic-backed endpoints report cache hits as cache_read_input_tokens,
+    OpenAI-style ones as prompt_tokens_details.cached_tokens.
+    """
+    if usage is None:
+        return {}
+    cached = getattr(usage, 'cache_read_input_tokens', None)
+    if cached is None:
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached = getattr(details, 'cached_tokens', None) if details is not None else None
+    return {'prompt_tokens': getattr(usage, 'prompt_tokens', 0) or 0, 'cached_tokens': cached or 0}
+
+def _supports_prompt_caching(model: str) -> bool:
+    """Whether a model accepts cache_control markers on system content parts."""
+    model = model.lower()
+    return 'claude' in model or 'anthropic' in model
+
+# Shared API clients: one connection pool per (api_key, base_url) for the whole process
+_client_loop: Optional["asyncio.AbstractEventLoop"] = None
+_open_clients: List["AsyncOpenAI"] = []
+
+@lru_cache(maxsize=4)
+def _build_client(api_key: str, base_url: Optional[str]) -> "AsyncOpenAI":
+    """Build (once) the async OpenAI client for a given endpoint."""
+    # Imported here: openai pulls in httpx/pydantic, which dominates CLI startup
+    try:
+        from openai import AsyncOpenAI
+    except ImportError:
+        raise RayLMConfigurationError("openai package is required. Install it with: pip install openai")
+    
+    client_config = {"api_key": api_key}
+    if base_url:
+        client_config["base_url"] = base_url
+    
+    try:
+        import httpx
+        try:
+            import h2  # noqa: F401  (HTTP/2 support is optional)
+            http2 = True
+        except ImportError:
+            http2 = False
+        client_config["http_client"] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            http2=http2
+        )
+    except ImportError:
+        pass
+    
+    client = AsyncOpenAI(**client_config)
+    _open_clients.append(client)
+    return client
+
+def _get_client_loop() -> "asyncio.AbstractEventLoop":
+    """Event loop shared by all LLMClients; async connections are bound to the loop that opened them."""
+    global _client_loop
+    if _client_loop is None or _client_loop.is_closed():
+        # Imported here: asyncio (with ssl) is the largest import, and --help, --render
+        # and --client never make an API call
+        import asyncio
+        _client_loop = asyncio.new_event_loop()
+    return _client_loop
+
+def close_clients() -> None:
+    """Close every shared API client and the shared event loop."""
+    global _client_loop
+    if _client_loop is not None and _client_loop.is_running():
+        # A cancelled background request still holds the loop; the process is exiting anyway
+        return
+    if _client_loop is not None and not _client_loop.is_closed():
+        for client in _open_clients:
+            _client_loop.run_until_complete(client.close())
+        _client_loop.close()
+    _open_clients.clear()
+    _build_client.cache_clear()
+    _client_loop = None
+
+# Cancellation shared by API retries and renders; set from the SIGINT handler in main()
+_cancel_event = threading.Event()
+_live_processes: set = set()  # Running POV-Ray processes, terminated on cancel
+_live_processes_lock = threading.Lock()
+
+def cancel_all() -> None:
+    """Stop pending retries and queued frames, and terminate running POV-Ray processes."""
+    _cancel_event.set()
+    with _live_processes_lock:
+        processes = list(_live_processes)
+    for proc in processes:
+        if proc.poll() is None:
+            proc.terminate()
+
+async def _cancellable_sleep(delay: float) -> None:
+    """Sleep for delay seconds, raising RayLMCancelledError as soon as the run is cancelled."""
+    import asyncio
+    cancelled = await asyncio.get_running_loop().run_in_executor(None, _cancel_event.wait, delay)
+    if cancelled:
+        raise RayLMCancelledError("Cancelled while waiting to retry")
+
+# Enhanced LLM client with retry logic
+class LLMClient:
+    """Enhanced LLM client with retry logic and error handling."""
+    
+    # System prompts are module constants so every request shares an identical prefix
+    GENERATOR_SYSTEM_PROMPT = _GEN_SYSTEM_PROMPT
+    TEMPLATE_SYSTEM_PROMPT = _TEMPLATE_SYSTEM_PROMPT  # Slot-filling variant used in template mode
+    VERIFIER_SYSTEM_PROMPT = _VER_SYSTEM_PROMPT
+    
+    # JSON schema for structured generator output
+    SCENE_RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "povray_scene",
+            "schema": {
+                "type": "object",
+                "required": ["scene_code"],
+                "properties": {
+                    "scene_code": {"type": "string"},
+                    "includes": {"type": "array", "items": {"type": "string"}}
+                }
+            }
+        }
+    }
+    
+    TEMPLATE_RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "povray_scene_slots",
+            "schema": {
+                "type": "object",
+                "required": ["camera", "light_source", "objects"],
+                "properties": {
+                    "includes": {"type": "array", "items": {"type": "string"}},
+                    "camera": {"type": "string"},
+                    "light_source": {"type": "string"},
+                    "objects": {"type": "string"}
+                }
+            }
+        }
+    }
+    
+    def __init__(self, config: RayLMConfig):
+        self.config = config
+        self._client = None
+        self._response_format_rejected = False  # Set once the endpoint refuses response_format
+        self._cache = LLMCache(config.temp_dir / "cache") if config.enable_cache else None
+        self._initialize_client()
+    
+    def _initialize_client(self) -> None:
+        """Attach the shared async OpenAI client for this endpoint."""
+        try:
+            self._client = _build_client(self.config.api_key, self.config.base_url)
+            logger.info("LLM client initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize LLM client: {e}")
+            raise RayLMConfigurationError(f"Failed to initialize LLM client: {e}")
+    
+    def run_sync(self, coro):
+        """Run a coroutine to completion on the shared client event loop.
         
-        user_prompt = f"""Generate a POV-Ray scene for: {prompt}
+        A single loop is kept for the whole process so the connection pool
+        of the shared async client can be reused between calls.
+        """
+        return _get_client_loop().run_until_complete(coro)
+    
+    @staticmethod
+    def _scene_user_prompt(prompt: str) -> str:
+        """User message for generating a single scene."""
+        return f"""Generate a POV-Ray scene for: {prompt}
 
 Ensure the scene is complete, visually interesting, and uses proper POV-Ray SDL syntax. Include all necessary components (camera, lights, objects, materials)."""
+    
+    @property
+    def generator_system_prompt(self) -> str:
+        """System prompt for single-scene generation in the current mode."""
+        if self.config.template_mode:
+            return self.TEMPLATE_SYSTEM_PROMPT
+        return self.GENERATOR_SYSTEM_PROMPT
+    
+    def _scene_request_body(self, prompt: str) -> Dict[str, Any]:
+        """Chat completion payload for generating a single scene."""
+        body = {
+            "model": self.config.generator_model,
+            "messages": [
+                {"role": "system", "content": self.generator_system_prompt},
+                {"role": "user", "content": self._scene_user_prompt(prompt)}
+            ],
+            "temperature": self.config.generator_temperature,
+            "max_tokens": 4000
+        }
+        if self._response_format_rejected:
+            return body
+        if self.config.template_mode:
+            body["response_format"] = self.TEMPLATE_RESPONSE_FORMAT
+        elif self.config.structured_output:
+            body["response_format"] = self.SCENE_RESPONSE_FORMAT
+        return body
+    
+    @staticmethod
+    def fill_template(slots: Dict[str, Any]) -> str:
+        """Assemble a scene from POVRAY_TEMPLATE and the model's slot values."""
+        includes = list(_REQUIRED_INCLUDES)
+        for name in slots.get("includes") or ():
+            name = str(name).strip().strip('"')
+            if _INCLUDE_NAME_RE.match(name) and name not in includes:
+                includes.append(name)
+        
+        return POVRAY_TEMPLATE.format(
+            includes="\n".join(f'#include "{name}"' for name in includes),
+            camera=slots["camera"].strip(),
+            light_source=slots["light_source"].strip(),
+            objects=slots["objects"].strip()
+        ).strip()
+    
+    def _parse_scene_response(self, content: str) -> str:
+        """Extract scene code from a generator response.
+        
+        With structured output the code is the 'scene_code' field of a JSON
+        object; in template mode the JSON slots are formatted into
+        POVRAY_TEMPLATE. A response that is not valid JSON is used as-is.
+        """
+        if self.config.template_mode:
+            try:
+                return self.fill_template(json.loads(content))
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.warning(f"Template slots could not be parsed ({e}); using raw content")
+        elif self.config.structured_output and not self._response_format_rejected:
+            try:
+                return json.loads(content)["scene_code"].strip()
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.warning(f"Structured response could not be parsed ({e}); using raw content")
+        return content.strip()
+    
+    async def _complete(self, usage: Optional[Dict[str, int]] = None, quiet: bool = False,
+                        **request) -> str:
+        """Run a chat completion and return the message text.
+        
+        When config.stream_responses is set the completion is streamed and
+        the deltas are collected as they arrive, printing a progress dot
+        every 50 chunks unless quiet is set. If a usage dict is given it is
+        filled with the prompt and cached-prefix token counts reported by
+        the endpoint.
+        """
+        if not self.config.stream_responses:
+            response = await self._client.chat.completions.create(**request)
+            if usage is not None:
+                usage.update(_prompt_token_usage(response.usage))
+            return response.choices[0].message.content
+        
+        if usage is not None:
+            request['stream_options'] = {"include_usage": True}
+        stream = await self._client.chat.completions.create(**request, stream=True)
+        chunks = []
+        async for event in stream:
+            if usage is not None and getattr(event, 'usage', None):
+                usage.update(_prompt_token_usage(event.usage))
+            if event.choices and event.choices[0].delta.content:
+                chunks.append(event.choices[0].delta.content)
+                if not quiet and len(chunks) % 50 == 0:
+                    print(".", end="", flush=True)
+        return "".join(chunks)
+    
+    async def submit_batch(self, prompts: List[str]) -> Tuple[str, Dict[str, str]]:
+        """Submit prompts to the Batch API (24h window, discounted, separate rate limits).
+        
+        Returns the batch id and a mapping of custom_id -> prompt.
+        """
+        requests_file = self.config.temp_dir / f"raylm_batch_{uuid.uuid4().hex}.jsonl"
+        id_map = {}
         
-        def _make_api_call():
-            return self._client.chat.completions.create(
-                model=self.config.generator_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=4000,
-                timeout=self.config.api_timeout
+        try:
+            with open(requests_file, "w", encoding="utf-8") as f:
+                for i, prompt in enumerate(prompts):
+                    custom_id = f"{i}-{hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]}"
+                    id_map[custom_id] = prompt
+                    f.write(json.dumps({
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": self._scene_request_body(prompt)
+                    }) + "\n")
+            
+            with open(requests_file, "rb") as f:
+                uploaded = await self._client.files.create(file=f, purpose="batch")
+            
+            batch = await self._client.batches.create(
+                input_file_id=uploaded.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
             )
+            logger.info(f"Submitted batch {batch.id} with {len(prompts)} requests")
+            return batch.id, id_map
+            
+        except Exception as e:
+            logger.error(f"Failed to submit batch: {e}")
+            raise RayLMAPIError(f"Batch submission failed: {e}")
+        finally:
+            requests_file.unlink(missing_ok=True)
+    
+    async def poll_batch(self, batch_id: str, poll_interval: Optional[float] = None):
+        """Wait until a batch reaches a terminal state and return it."""
+        import asyncio
+        if poll_interval is None:
+            poll_interval = self.config.batch_poll_interval
+        
+        while True:
+            try:
+                batch = await self._client.batches.retrieve(batch_id)
+            except Exception as e:
+                raise RayLMAPIError(f"Failed to retrieve batch {batch_id}: {e}")
+            
+            counts = batch.request_counts
+            if counts:
+                logger.info(f"Batch {batch_id}: {batch.status} ({counts.completed}/{counts.total} done)")
+            
+            if batch.status in ("completed", "failed", "expired", "cancelled"):
+                return batch
+            
+            await asyncio.sleep(poll_interval)
+    
+    async def fetch_batch_results(self, batch) -> Dict[str, Union[str, Exception]]:
+        """Download a finished batch's output and return custom_id -> scene code (or error)."""
+        if not batch.output_file_id:
+            raise RayLMAPIError(f"Batch {batch.id} has no output (status: {batch.status})")
+        
+        try:
+            content = await self._client.files.content(batch.output_file_id)
+        except Exception as e:
+            raise RayLMAPIError(f"Failed to download batch output: {e}")
+        
+        results = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                results[record["custom_id"]] = RayLMAPIError(str(record.get("error") or response))
+                continue
+            
+            scene_code = self._parse_scene_response(response["body"]["choices"][0]["message"]["content"])
+            brace_counts = _count_braces(scene_code)
+            is_valid, errors = ValidationSystem.validate_scene_code(scene_code, brace_counts)
+            if not is_valid:
+                logger.warning(f"Batch result {record['custom_id']} validation failed: {errors}")
+                scene_code = fix_common_issues(scene_code, brace_counts)
+            results[record["custom_id"]] = scene_code
+        
+        return results
+    
+    async def generate_many(self, prompts: List[str],
+                            metrics_list: Optional[List[PerformanceMetrics]] = None,
+                            verify: bool = False) -> List[Union[str, Exception]]:
+        """Generate scene code for several prompts concurrently.
+        
+        At most config.max_concurrency requests are in flight at once. Failed
+        prompts yield their exception instead of aborting the whole batch.
+        With verify, scenes that fail local validation are sent to the
+        verifier straight away, overlapping with the other generations; a
+        failed verification keeps the draft and is recorded in its metrics.
+        """
+        if metrics_list is None:
+            metrics_list = [PerformanceMetrics("scene_generation") for _ in prompts]
+        
+        import asyncio
+        sem = asyncio.Semaphore(self.config.max_concurrency)
+        
+        async def _bounded(prompt: str, metrics: PerformanceMetrics) -> str:
+            async with sem:
+                scene_code = await self.generate_scene_code(prompt, metrics)
+                if not verify or not self.config.verifier_model:
+                    return scene_code
+                is_valid, _ = ValidationSystem.validate_scene_code(scene_code)
+                if is_valid and ValidationSystem.has_required_structure(scene_code):
+                    return scene_code
+                try:
+                    return await self.verify_scene_code(scene_code, prompt, metrics, quiet=True)
+                except RayLMAPIError as e:
+                    logger.warning(f"Scene verification failed: {e}")
+                    metrics.metadata['verification_error'] = str(e)
+                    return scene_code
+        
+        tasks = [_bounded(p, m) for p, m in zip(prompts, metrics_list)]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def generate_scene_code(self, prompt: str, metrics: PerformanceMetrics) -> str:
+        """Generate POV-Ray scene code with retry logic.
+        
+        If the endpoint rejects response_format, the request is repeated once
+        without it and structured output stays off for this generator.
+        """
+        from openai import BadRequestError
+        
+        system_prompt = self.generator_system_prompt
+        user_prompt = self._scene_user_prompt(prompt)
+        
+        async def _make_api_call():
+            request = self._scene_request_body(prompt)
+            try:
+                return await self._complete(**request, timeout=self.config.api_timeout)
+            except BadRequestError as e:
+                if "response_format" not in request:
+                    raise
+                logger.warning(f"{self.config.generator_model} rejected response_format ({e}); "
+                               "retrying without structured output")
+                self._response_format_rejected = True
+                del request["response_format"]
+                return await self._complete(**request, timeout=self.config.api_timeout)
         
         try:
             print(f"🎨 Generating scene code with {self.config.generator_model}")
             logger.info(f"Generating scene code with model: {self.config.generator_model}")
             
-            # Show progress during generation
-            print("⏳ Contacting AI model...", end="", flush=True)
-            
-            response = self._retry_api_call(_make_api_call)
+            cache_key = None
+            if self._cache is not None:
+                cache_key = LLMCache.cache_key(self.config.generator_model, system_prompt,
+                                               user_prompt, self.config.generator_temperature)
+            cached = self._cache.get(cache_key) if cache_key else None
+            
+            if cached is not None:
+                print("⚡ Using cached AI response")
+                logger.info("Scene code served from cache")
+                metrics.metadata['cache_hit'] = True
+                scene_code = cached
+            else:
+                # Show progress during generation
+                print("⏳ Contacting AI model...", end="", flush=True)
+                
+                content = await self._retry_api_call(_make_api_call, metrics)
+                
+                print(" ✅")
+                scene_code = self._parse_scene_response(content)
+                if cache_key:
+                    self._cache.set(cache_key, scene_code)
             
-            print(" ✅")
             print("📝 Processing AI response...", end="", flush=True)
             
-            scene_code = response.choices[0].message.content.strip()
-            
             # Basic validation
-            is_valid, errors = ValidationSystem.validate_scene_code(scene_code)
+            brace_counts = _count_braces(scene_code)
+            is_valid, errors = ValidationSystem.validate_scene_code(scene_code, brace_counts)
             if not is_valid:
                 logger.warning(f"Generated code validation failed: {errors}")
                 # Try to fix common issues
-                scene_code = fix_common_issues(scene_code)
+                scene_code = fix_common_issues(scene_code, brace_counts)
             
             logger.debug(f"Generated scene code (length: {len(scene_code)} chars)")
             print(f" ✅ ({len(scene_code)} chars)")
@@ -501,26 +1132,75 @@ Ensure the scene is complete, visually interesting, and uses proper POV-Ray SDL
             logger.error(f"Failed to generate scene code: {e}")
             raise RayLMAPIError(f"Scene code generation failed: {e}")
     
-    def verify_scene_code(self, scene_code: str, prompt: str, metrics: PerformanceMetrics) -> str:
-        """Verify and correct POV-Ray scene code."""
+    async def generate_scene_codes_batch(self, prompts: List[str], metrics: PerformanceMetrics) -> List[str]:
+        """Generate scene code for several prompts in a single chat completion.
         
-        system_prompt = """You are an expert POV-Ray code reviewer and validator.
-
-Your task is to:
-1. Verify the syntax and completeness of POV-Ray code
-2. Fix any syntax errors, missing includes, or structural issues
-3. Ensure the code follows POV-Ray best practices
-4. Return ONLY the corrected POV-Ray code
-5. Do NOT add explanations, comments, or markdown
+        The system prompt is sent once for the whole batch and the model returns
+        a JSON object {"scenes": [...]} with one scene per prompt, in order.
+        """
+        user_prompt = f"""Generate one POV-Ray scene for each of the {len(prompts)} prompts below.
 
-CRITICAL REQUIREMENTS:
-- Must include: colors.inc, textures.inc, finish.inc
-- Must have camera, light_source, and at least one object
-- All braces must be balanced
-- All statements must be properly terminated
-- Use proper POV-Ray SDL syntax
+This is a batch request: return a JSON object {{"scenes": [...]}} where scenes[i] is the complete
+POV-Ray SDL code for prompt i, as a string. Each scene must follow all the requirements above.
+Return exactly {len(prompts)} scenes, in the same order as the prompts.
 
-Return ONLY the corrected code, nothing else."""
+Prompts:
+{json.dumps(prompts, ensure_ascii=False, indent=2)}"""
+        
+        async def _make_api_call():
+            return await self._complete(
+                model=self.config.generator_model,
+                messages=[
+                    {"role": "system", "content": self.GENERATOR_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=self.config.generator_temperature,
+                max_tokens=4000 * len(prompts),
+                response_format={"type": "json_object"},
+                timeout=self.config.api_timeout
+            )
+        
+        try:
+            print(f"🎨 Generating {len(prompts)} scenes in one request with {self.config.generator_model}")
+            logger.info(f"Generating {len(prompts)} scenes in one request with model: {self.config.generator_model}")
+            
+            print("⏳ Contacting AI model...", end="", flush=True)
+            content = await self._retry_api_call(_make_api_call, metrics)
+            print(" ✅")
+            
+            scenes = json.loads(content)["scenes"]
+            if not isinstance(scenes, list) or len(scenes) != len(prompts):
+                raise ValueError(f"Expected {len(prompts)} scenes, got {len(scenes) if isinstance(scenes, list) else type(scenes).__name__}")
+            
+            scene_codes = []
+            for i, scene_code in enumerate(scenes):
+                scene_code = str(scene_code).strip()
+                brace_counts = _count_braces(scene_code)
+                is_valid, errors = ValidationSystem.validate_scene_code(scene_code, brace_counts)
+                if not is_valid:
+                    logger.warning(f"Batch scene {i + 1} validation failed: {errors}")
+                    scene_code = fix_common_issues(scene_code, brace_counts)
+                scene_codes.append(scene_code)
+            
+            metrics.metadata['model_used'] = self.config.generator_model
+            metrics.metadata['batch_size'] = len(prompts)
+            metrics.metadata['response_length'] = sum(len(c) for c in scene_codes)
+            
+            logger.info(f"Batch of {len(scene_codes)} scenes generated successfully")
+            return scene_codes
+            
+        except Exception as e:
+            metrics.complete(str(e))
+            logger.error(f"Failed to generate scene batch: {e}")
+            raise RayLMAPIError(f"Batch scene generation failed: {e}")
+    
+    async def verify_scene_code(self, scene_code: str, prompt: str, metrics: PerformanceMetrics,
+                                quiet: bool = False) -> str:
+        """Verify and correct POV-Ray scene code.
+        
+        quiet suppresses console output (logging is unaffected), for
+        verification running in the background while the caller prints.
+        """
         
         user_prompt = f"""Please review and correct this POV-Ray code:
 
@@ -531,11 +1211,23 @@ POV-Ray Code:
 
 Return only the corrected POV-Ray code."""
         
-        def _make_api_call():
-            return self._client.chat.completions.create(
+        # The system prompt is identical on every call, so it is marked as a
+        # cacheable prefix; only the candidate scene in the user turn varies.
+        # Only Claude models understand cache_control on system content parts
+        if self.config.prompt_caching and _supports_prompt_caching(self.config.verifier_model):
+            system_content = [{"type": "text", "text": self.VERIFIER_SYSTEM_PROMPT,
+                               "cache_control": {"type": "ephemeral"}}]
+        else:
+            system_content = self.VERIFIER_SYSTEM_PROMPT
+        usage: Dict[str, int] = {}
+        
+        async def _make_api_call():
+            return await self._complete(
+                usage=usage,
+                quiet=quiet,
                 model=self.config.verifier_model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": system_content},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.2,
@@ -544,17 +1236,20 @@ Return only the corrected POV-Ray code."""
             )
         
         try:
-            print(f"🔍 Verifying scene code with {self.config.verifier_model}")
+            if not quiet:
+                print(f"🔍 Verifying scene code with {self.config.verifier_model}")
             logger.info(f"Verifying scene code with model: {self.config.verifier_model}")
             
-            print("⏳ Contacting verification model...", end="", flush=True)
+            if not quiet:
+                print("⏳ Contacting verification model...", end="", flush=True)
             
-            response = self._retry_api_call(_make_api_call)
+            content = await self._retry_api_call(_make_api_call, metrics)
             
-            print(" ✅")
-            print("🔧 Processing verification...", end="", flush=True)
+            if not quiet:
+                print(" ✅")
+                print("🔧 Processing verification...", end="", flush=True)
             
-            corrected_code = response.choices[0].message.content.strip()
+            corrected_code = content.strip()
             
             # Validate the corrected code
             is_valid, errors = ValidationSystem.validate_scene_code(corrected_code)
@@ -563,9 +1258,14 @@ Return only the corrected POV-Ray code."""
                 raise ValueError(f"Verification failed: {errors}")
             
             logger.debug(f"Corrected scene code (length: {len(corrected_code)} chars)")
-            print(f" ✅ ({len(corrected_code)} chars)")
+            if not quiet:
+                print(f" ✅ ({len(corrected_code)} chars)")
             
             metrics.metadata['verification_model'] = self.config.verifier_model
+            if usage:
+                metrics.metadata['verification_cached_tokens'] = usage['cached_tokens']
+                logger.info(f"Verifier prompt cache: {usage['cached_tokens']}/{usage['prompt_tokens']} "
+                            f"prompt tokens read from cache")
             logger.info(f"Scene code verified and corrected ({len(corrected_code)} characters)")
             return corrected_code
             
@@ -574,60 +1274,221 @@ Return only the corrected POV-Ray code."""
             logger.error(f"Failed to verify scene code: {e}")
             raise RayLMAPIError(f"Scene code verification failed: {e}")
     
-    def _retry_api_call(self, api_call_func):
-        """Retry API calls with exponential backoff."""
+    async def _retry_api_call(self, api_call_func, metrics: Optional[PerformanceMetrics] = None):
+        """Retry transient API failures with jittered exponential backoff; other errors propagate.
+        
+        Only rate limits, 5xx responses and connection failures/timeouts are
+        retried. Other status errors (bad request, authentication, permission,
+        not found) would fail the same way again, so they are raised at once.
+        The random factor keeps concurrent clients hit by the same rate limit
+        from retrying in lockstep; max_delay caps the sleep on late attempts.
+        """
+        import httpx
+        from openai import APIConnectionError, InternalServerError, RateLimitError
+        
         last_exception = None
         
         for attempt in range(self.config.max_retries):
+            if _cancel_event.is_set():
+                raise RayLMCancelledError("API call cancelled")
+            if metrics is not None and attempt:
+                metrics.metadata['retries'] = metrics.metadata.get('retries', 0) + 1
             try:
-                return api_call_func()
+                return await api_call_func()
                 
-            except (RateLimitError, APIError) as e:
+            except (RateLimitError, InternalServerError) as e:
                 last_exception = e
                 if attempt == self.config.max_retries - 1:
                     break
                 
-                delay = self.config.retry_delay * (2 ** attempt)
-                logger.warning(f"API call attempt {attempt + 1} failed: {e}. Retrying in {delay}s...")
-                time.sleep(delay)
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"API call attempt {attempt + 1} failed: {e}. Retrying in {delay:.1f}s...")
+                await _cancellable_sleep(delay)
                 
-            except (Timeout, Exception) as e:
+            except (APIConnectionError, httpx.ConnectError, httpx.ReadTimeout) as e:
+                # APIConnectionError includes APITimeoutError
                 last_exception = e
                 if attempt == self.config.max_retries - 1:
                     break
                 
-                delay = self.config.retry_delay * (2 ** attempt)
-                logger.warning(f"API call attempt {attempt + 1} timed out: {e}. Retrying in {delay}s...")
-                time.sleep(delay)
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"API call attempt {attempt + 1} timed out: {e}. Retrying in {delay:.1f}s...")
+                await _cancellable_sleep(delay)
         
         raise last_exception or RayLMAPIError("API call failed after all retries")
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Seconds to wait before retrying after the given (0-based) attempt."""
+        delay = self.config.retry_delay * (2 ** attempt) * (1 + random.uniform(0, self.config.jitter))
+        return min(self.config.max_delay, delay)
 
-def fix_common_issues(scene_code: str) -> str:
+def fix_common_issues(scene_code: str, brace_counts: Optional[Tuple[int, int]] = None) -> str:
     """Fix common issues in generated POV-Ray code."""
-    # Add missing includes if they're completely missing
-    includes = ['colors.inc', 'textures.inc', 'finish.inc']
-    for include in includes:
-        if f'#include "{include}"' not in scene_code:
-            scene_code = f'#include "{include}"\n' + scene_code
+    # Add missing includes if they're completely missing. One scan collects the
+    # includes present, stopping once all required ones are seen (usually in the header).
+    present = set()
+    for match in _INCLUDE_DIRECTIVE_RE.finditer(scene_code):
+        if match.group(1) in _REQUIRED_INCLUDES:
+            present.add(match.group(1))
+            if len(present) == len(_REQUIRED_INCLUDES):
+                break
+    # Collected as parts and joined once; reversed keeps the order the old prepend loop produced
+    parts = [directive + '\n'
+             for include, directive in reversed(list(zip(_REQUIRED_INCLUDES, _INCLUDE_DIRECTIVES)))
+             if include not in present]
+    parts.append(scene_code)
     
     # Fix unbalanced braces by adding closing braces
-    open_braces = scene_code.count('{')
-    close_braces = scene_code.count('}')
+    open_braces, close_braces = brace_counts or _count_braces(scene_code)
     if open_braces > close_braces:
-        scene_code += '}' * (open_braces - close_braces)
+        parts.append('}' * (open_braces - close_braces))
     
-    return scene_code
+    return ''.join(parts) if len(parts) > 1 else scene_code
+
+# FFmpeg video encoders, in order of preference. Hardware encoders run on the
+# GPU's video engine; libx264 is the CPU fallback and is always tried last.
+_HW_ENCODERS = (
+    ("h264_nvenc", ["-c:v", "h264_nvenc", "-preset", "p4", "-tune", "hq",
+                    "-rc", "vbr", "-cq", "23", "-pix_fmt", "yuv420p"]),
+    ("h264_videotoolbox", ["-c:v", "h264_videotoolbox", "-q:v", "65", "-pix_fmt", "yuv420p"]),
+    ("h264_vaapi", ["-vaapi_device", "/dev/dri/renderD128", "-vf", "format=nv12,hwupload",
+                    "-c:v", "h264_vaapi", "-qp", "23"]),
+)
+_CPU_ENCODER = ("libx264", ["-c:v", "libx264",
+                            "-preset", "medium",  # Balance between speed and quality
+                            "-crf", "23",  # Quality level (lower = better quality)
+                            "-pix_fmt", "yuv420p"])  # Compatibility
+
+def _send_frame(pipe, frame_file: Path) -> None:
+    """Write a frame file to FFmpeg's stdin.
+    
+    Uses os.sendfile where the platform allows a pipe as the destination
+    (Linux), so the PNG goes from the page cache to the pipe without being
+    copied through Python; elsewhere the bytes are read and written.
+    """
+    if hasattr(os, 'sendfile'):
+        pipe.flush()
+        with open(frame_file, 'rb') as src:
+            size = os.fstat(src.fileno()).st_size
+            offset = 0
+            try:
+                while offset < size:
+                    sent = os.sendfile(pipe.fileno(), src.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return
+            except BrokenPipeError:
+                raise
+            except OSError as e:
+                # Only fall back if nothing was sent, or the frame would be duplicated
+                if offset or e.errno not in (errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK, errno.EOPNOTSUPP):
+                    raise
+    pipe.write(frame_file.read_bytes())
+
+@lru_cache(maxsize=1)
+def _ffmpeg_available() -> bool:
+    """Whether an ffmpeg binary runs (probed once per process)."""
+    if shutil.which('ffmpeg') is None:
+        return False
+    try:
+        subprocess.run(['ffmpeg', '-version'], capture_output=True, timeout=10, check=True)
+    except (subprocess.SubprocessError, OSError):
+        # Missing, unexecutable, hanging or failing binaries all mean "not available"
+        return False
+    return True
+
+@lru_cache(maxsize=1)
+def _ffmpeg_encoders() -> frozenset:
+    """Names of the encoders this FFmpeg build provides (probed once per process)."""
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                capture_output=True, text=True, timeout=10)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return frozenset()
+    # Encoder lines look like " V....D h264_nvenc   NVIDIA NVENC H.264 encoder"
+    return frozenset(parts[1] for parts in (line.split() for line in result.stdout.splitlines())
+                     if len(parts) >= 2)
+
+@lru_cache(maxsize=None)
+def _hw_encoder_works(encoder_name: str) -> bool:
+    """Whether a listed hardware encoder can actually encode here (probed once per encoder).
+    
+    FFmpeg lists the encoders it was built with, not the ones this machine can
+    drive; distro builds list h264_nvenc without any NVIDIA GPU. One generated
+    frame is encoded to the null muxer to find out.
+    """
+    cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error',
+           '-f', 'lavfi', '-i', 'color=c=black:s=256x256', '-frames:v', '1',
+           *dict(_HW_ENCODERS)[encoder_name], '-f', 'null', '-']
+    try:
+        subprocess.run(cmd, stdin=subprocess.DEVNULL, capture_output=True, timeout=30, check=True)
+    except (subprocess.SubprocessError, OSError):
+        return False
+    return True
+
+def _available_memory() -> Optional[int]:
+    """Bytes of memory available for new processes, or None if it cannot be told."""
+    try:
+        import psutil  # Optional; /proc/meminfo and sysconf cover the common cases
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    try:
+        with open('/proc/meminfo', 'rb') as f:
+            for line in f:
+                if line.startswith(b'MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def _iter_output_lines(stream):
+    """Yield the non-empty lines of a binary stream as bytes, as soon as they arrive.
+    
+    POV-Ray redraws its progress line with carriage returns, so both \\r and
+    \\n end a line. Nothing is decoded here; callers decode only the lines
+    they show or report.
+    """
+    pending = b''
+    while True:
+        chunk = stream.read1(65536)
+        if not chunk:
+            break
+        *lines, pending = _LINE_BREAK_RE.split(pending + chunk)
+        for line in lines:
+            line = line.rstrip()
+            if line:
+                yield line
+    pending = pending.rstrip()
+    if pending:
+        yield pending
 
 # Enhanced POV-Ray renderer
 class POVRayRenderer:
     """Enhanced POV-Ray renderer with comprehensive error handling."""
     
+    # Installation check result, shared by all renderers in the process
+    _validated: bool = False
+    _version: str = ''
+    
     def __init__(self, config: RayLMConfig):
         self.config = config
+        # Resolved parent directories; frames share a directory, so resolve() runs once per dir
+        self._resolved_dirs: Dict[str, str] = {}
         self._validate_povray_installation()
     
     def _validate_povray_installation(self) -> None:
-        """Validate that POV-Ray is properly installed."""
+        """Validate that POV-Ray is properly installed (probed once per process)."""
+        if POVRayRenderer._validated:
+            return
+        if shutil.which('povray') is None:
+            # A PATH lookup is far cheaper than spawning a missing binary
+            raise RayLMConfigurationError("POV-Ray not found. Please install POV-Ray 3.7 or later.")
+        
         try:
             result = subprocess.run(
                 ['povray', '--version'], 
@@ -639,128 +1500,213 @@ class POVRayRenderer:
             if result.returncode == 0:
                 version_info = result.stdout.strip()
                 logger.info(f"POV-Ray found: {version_info}")
+                POVRayRenderer._version = version_info
+                POVRayRenderer._validated = True
             else:
                 raise RayLMConfigurationError("POV-Ray installation verification failed")
                 
         except (subprocess.TimeoutExpired, FileNotFoundError):
             raise RayLMConfigurationError("POV-Ray not found. Please install POV-Ray 3.7 or later.")
     
-    def create_ini_file(self, scene_file: Path, output_file: Path, 
-                       width: int, height: int, quality: int = 9,
-                       antialiasing: str = "on", antialiasing_threshold: float = 0.3,
-                       antialiasing_depth: int = 2, clock_value: Optional[float] = None) -> Path:
-        """Create POV-Ray INI configuration file."""
+    def _resolve(self, path: Path, create_parent: bool = False) -> str:
+        """Return the absolute path, resolving each parent directory only once.
         
-        # Basic validation
-        if width <= 0 or height <= 0:
-            raise ValueError(f"Invalid dimensions: {width}x{height}")
+        Works on the path string, so the per-frame cost is one split, one
+        dict lookup and one join, with no intermediate Path objects.
+        """
+        head, name = os.path.split(os.fspath(path))
+        parent = self._resolved_dirs.get(head)
+        if parent is None:
+            if create_parent:
+                path.parent.mkdir(parents=True, exist_ok=True)
+            parent = self._resolved_dirs[head] = str(path.parent.resolve())
+        return os.path.join(parent, name)
+    
+    def build_render_options(self, scene_file: Path, output_file: Path, 
+                             width: int, height: int, quality: int = 9,
+                             antialiasing: str = "on", antialiasing_threshold: float = 0.3,
+                             antialiasing_depth: int = 2, clock_value: Optional[float] = None,
+                             threads: Optional[int] = None) -> List[str]:
+        """Build POV-Ray command-line options (passed on argv, so no INI file is written)."""
         
         if not scene_file.exists():
             raise FileNotFoundError(f"Scene file does not exist: {scene_file}")
         
-        # Ensure output directory exists
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        ini_content = f"""Input_File_Name="{scene_file.resolve()}"
-Output_File_Name="{output_file.resolve()}"
-Width={width}
-Height={height}
-Antialias={antialiasing}
-Antialias_Threshold={antialiasing_threshold}
-Antialias_Depth={antialiasing_depth}
-Quality={quality}
-Output_Alpha=Off
-Display=Off
-+W{width}+H{height}
-+Q{quality}
-+A{antialiasing_threshold}/{antialiasing_depth}
-"""
-        
-        # Add clock parameter for animations if provided
-        if clock_value is not None:
-            ini_content += f"Clock={clock_value}\n"
+        settings = self.render_settings(width, height, quality, antialiasing, antialiasing_threshold,
+                                        antialiasing_depth, clock_value, threads)
         
-        ini_file = scene_file.with_suffix(".ini")
+        # Output directory is created the first time it is seen
+        return [
+            f"+I{self._resolve(scene_file)}",
+            f"+O{self._resolve(output_file, create_parent=True)}",
+            *settings
+        ]
+    
+    @staticmethod
+    def render_settings(width: int, height: int, quality: int = 9,
+                        antialiasing: str = "on", antialiasing_threshold: float = 0.3,
+                        antialiasing_depth: int = 2, clock_value: Optional[float] = None,
+                        threads: Optional[int] = None) -> List[str]:
+        """Build the render options that do not name input/output files."""
         
-        try:
-            with open(ini_file, "w") as f:
-                f.write(ini_content)
-            logger.debug(f"INI file created: {ini_file}")
-            return ini_file
-        except Exception as e:
-            logger.error(f"Failed to create INI file: {e}")
-            raise RayLMRenderingError(f"INI file creation failed: {e}")
+        # Basic validation
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Invalid dimensions: {width}x{height}")
+        
+        options = [
+            f"+W{width}",
+            f"+H{height}",
+            f"+Q{quality}",
+            "+FN",  # PNG output; animation frames are piped to FFmpeg as PNG
+            "-UA",  # Output_Alpha=Off
+            "-D",   # Display=Off
+        ]
+        
+        if antialiasing == "on":
+            options += [f"+A{antialiasing_threshold}", f"+R{antialiasing_depth}"]
+        else:
+            options.append("-A")
+        
+        # Add clock parameter for animations if provided
+        if clock_value is not None:
+            options.append(f"+K{clock_value}")
+        
+        # Limit POV-Ray's own worker threads when several renders run side by side
+        if threads:
+            options.append(f"+WT{threads}")
+        
+        return options
     
-    def render_scene(self, scene_file: Path, output_file: Path, ini_file: Path, 
-                    timeout: Optional[int] = None, metrics: Optional[PerformanceMetrics] = None) -> bool:
-        """Render POV-Ray scene with comprehensive error handling."""
+    def render_scene(self, scene_file: Path, output_file: Path, render_options: List[str], 
+                    timeout: Optional[int] = None, metrics: Optional[PerformanceMetrics] = None,
+                    quiet: bool = False) -> bool:
+        """Render POV-Ray scene with comprehensive error handling.
+        
+        quiet suppresses console output (logging is unaffected), for renders
+        running concurrently with others.
+        """
         
         if timeout is None:
             timeout = self.config.default_timeout
         
         cmd = [
             "povray", 
-            str(ini_file),
+            *render_options,
             "+P",  # Progress reporting
             "+V"   # Verbose output
         ]
         
+        if _cancel_event.is_set():
+            raise RayLMCancelledError("Render cancelled")
+        
         start_time = time.time()
         
         try:
             logger.info(f"Rendering scene: {scene_file.name} -> {output_file.name}")
             
-            print(f"🖼️  Starting POV-Ray render ({width}x{height}, Q{quality})...")
-            print(f"   This may take a while. Progress will be shown below:")
+            if not quiet:
+                print(f"🖼️  Starting POV-Ray render ({scene_file.name} -> {output_file.name})...")
+                print(f"   This may take a while. Progress will be shown below:")
             
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=timeout,
+            # Stream output instead of buffering it: progress is shown live and
+            # only the last lines are kept for error reporting
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 cwd=scene_file.parent
             )
+            with _live_processes_lock:
+                _live_processes.add(proc)
+            if _cancel_event.is_set():
+                # Cancelled while the process was starting
+                proc.terminate()
+            timed_out = threading.Event()
+            
+            def _on_timeout():
+                timed_out.set()
+                proc.kill()
+            
+            timer = threading.Timer(timeout, _on_timeout) if timeout else None
+            if timer:
+                timer.daemon = True
+                timer.start()
+            
+            # Output stays as bytes; only logged, shown or reported lines are decoded
+            tail = deque(maxlen=200)
+            showing_progress = False
+            # +V output can run to thousands of lines; decide once whether they are logged
+            log_lines = logger.isEnabledFor(logging.DEBUG)
+            try:
+                for line in _iter_output_lines(proc.stdout):
+                    tail.append(line)
+                    if log_lines:
+                        logger.debug(line.decode("utf-8", errors="replace"))
+                    if not quiet and (b'Rendered' in line or b'Rendering' in line):
+                        print(f"\r   {line.decode('utf-8', errors='replace')}", end="", flush=True)
+                        showing_progress = True
+                returncode = proc.wait()
+            finally:
+                if timer:
+                    timer.cancel()
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                proc.stdout.close()
+                with _live_processes_lock:
+                    _live_processes.discard(proc)
+            
+            if showing_progress:
+                print()
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            if returncode != 0 and _cancel_event.is_set():
+                raise RayLMCancelledError("Render cancelled")
             
             render_time = time.time() - start_time
             
-            if result.returncode == 0:
-                print(f"✅ Render completed successfully!")
+            if returncode == 0:
+                if not quiet:
+                    print(f"✅ Render completed successfully!")
                 logger.info(f"Rendering completed successfully in {render_time:.2f}s: {output_file}")
                 
-                # Verify output file was created
-                if output_file.exists():
+                # Verify output file was created (a single stat answers both questions)
+                try:
                     file_size = output_file.stat().st_size
-                    print(f"📁 Output file: {output_file.name} ({file_size / 1024:.1f} KB)")
-                    logger.info(f"Output file size: {file_size / 1024:.2f} KB")
-                    
-                    if metrics:
-                        metrics.metadata['render_time'] = render_time
-                        metrics.metadata['output_size'] = file_size
-                        metrics.metadata['command'] = ' '.join(cmd)
-                    
-                    return True
-                else:
-                    print(f"⚠️  POV-Ray reported success but output file not found")
+                except FileNotFoundError:
+                    if not quiet:
+                        print(f"⚠️  POV-Ray reported success but output file not found")
                     logger.warning(f"POV-Ray reported success but output file not found: {output_file}")
                     return False
+                
+                if not quiet:
+                    print(f"📁 Output file: {output_file.name} ({file_size / 1024:.1f} KB)")
+                logger.info(f"Output file size: {file_size / 1024:.2f} KB")
+                
+                if metrics:
+                    metrics.metadata['render_time'] = render_time
+                    metrics.metadata['output_size'] = file_size
+                    metrics.metadata['command'] = ' '.join(cmd)
+                
+                return True
                     
             else:
-                print(f"❌ Render failed (error code {result.returncode})")
-                logger.error(f"Rendering failed with error code {result.returncode}")
+                if not quiet:
+                    print(f"❌ Render failed (error code {returncode})")
+                logger.error(f"Rendering failed with error code {returncode}")
                 logger.error(f"Command: {' '.join(cmd)}")
-                logger.error(f"Error output: {result.stderr}")
-                
-                if result.stdout:
-                    logger.debug(f"Standard output: {result.stdout}")
+                output_log = b"\n".join(tail).decode("utf-8", errors="replace")
+                logger.error(f"Error output: {output_log}")
                 
                 if metrics:
-                    metrics.complete(f"POV-Ray error code {result.returncode}: {result.stderr}")
+                    metrics.complete(f"POV-Ray error code {returncode}: {output_log}")
                 
                 return False
                 
         except subprocess.TimeoutExpired:
             error_msg = f"Rendering timed out after {timeout} seconds"
-            print(f"❌ {error_msg}")
+            if not quiet:
+                print(f"❌ {error_msg}")
             logger.error(error_msg)
             
             if metrics:
@@ -768,6 +1714,11 @@ Display=Off
             
             raise RayLMTimeoutError(error_msg)
             
+        except RayLMCancelledError:
+            if metrics:
+                metrics.complete("Cancelled")
+            raise
+            
         except Exception as e:
             logger.error(f"Rendering failed with exception: {e}")
             
@@ -776,6 +1727,164 @@ Display=Off
             
             raise RayLMRenderingError(f"Rendering failed: {e}")
 
+def _render_frame_remote(scene_pieces: List[bytes], clock_line: bytes,
+                         settings: List[str], clock_option: str, timeout: int) -> bytes:
+    """Render one animation frame on a cluster worker and return the PNG bytes.
+    
+    settings are the options shared by every frame; clock_option is this
+    frame's +K value.
+    """
+    with tempfile.TemporaryDirectory(prefix='raylm_frame_') as work_dir:
+        scene_file = Path(work_dir) / "frame.pov"
+        output_file = Path(work_dir) / "frame.png"
+        scene_file.write_bytes(clock_line.join(scene_pieces))
+        
+        result = subprocess.run(
+            ["povray", f"+I{scene_file}", f"+O{output_file}", *settings, clock_option],
+            capture_output=True, text=True, errors="replace", timeout=timeout, cwd=work_dir
+        )
+        if result.returncode != 0 or not output_file.exists():
+            tail = "\n".join(result.stderr.splitlines()[-5:])
+            raise RuntimeError(f"POV-Ray exited with code {result.returncode}: {tail}")
+        return output_file.read_bytes()
+
+class _FrameProgress:
+    """Reports finished animation frames from the thread collecting results.
+    
+    Shows a tqdm bar when tqdm is installed and stdout is a terminal. Without
+    tqdm a terminal gets one counter line redrawn at most ten times a second;
+    other output (logs, pipes) gets one line per frame. Failures are always
+    printed on their own line.
+    """
+    
+    REDRAW_INTERVAL = 0.1  # Seconds between redraws of the inline counter
+    
+    def __init__(self, total_frames: int, total_jobs: Optional[int] = None):
+        self.total_frames = total_frames
+        self.total_jobs = total_frames if total_jobs is None else total_jobs
+        self.done = 0
+        self._bar = None
+        self._inline = False
+        self._last_draw = 0.0
+        self._drawn = ""
+        if sys.stdout.isatty():
+            try:
+                from tqdm import tqdm  # Optional: progress bar
+                self._bar = tqdm(total=self.total_jobs, unit="frame", desc="   🎬 Frames")
+            except ImportError:
+                self._inline = True
+    
+    def frame_done(self, index: int, ok: bool, detail: str = "") -> None:
+        """Record one finished frame (index is 0-based)."""
+        self.done += 1
+        if ok:
+            line = f"   🎬 Frame {index+1:3d}/{self.total_frames} ✅ ({self.done}/{self.total_jobs} done)"
+        else:
+            line = f"   🎬 Frame {index+1:3d}/{self.total_frames} ❌" + (f" ({detail})" if detail else "")
+        
+        if self._bar is not None:
+            self._bar.update(1)
+            if not ok:
+                self._bar.write(line)
+        elif not self._inline:
+            print(line)
+        else:
+            if not ok:
+                print("\r" + line.ljust(len(self._drawn)))
+                self._drawn = ""
+            now = time.monotonic()
+            if now - self._last_draw >= self.REDRAW_INTERVAL or self.done == self.total_jobs:
+                self._last_draw = now
+                self._drawn = f"   🎬 {self.done}/{self.total_jobs} frames done"
+                print("\r" + self._drawn, end="", flush=True)
+    
+    def close(self) -> None:
+        if self._bar is not None:
+            self._bar.close()
+        elif self._drawn:
+            print()
+
+class _FrameStreamEncoder:
+    """FFmpeg process fed with animation frames while they are still being rendered.
+    
+    Frames may finish in any order; each is written to FFmpeg's stdin once
+    all earlier frames have been written, then deleted. frame_done returns
+    how many frames were released so callers can bound the frames on disk.
+    Once FFmpeg has failed the stream cannot be recovered, so later frames
+    are deleted without being written, and abort deletes any still held.
+    """
+    
+    def __init__(self, cmd: List[str], cwd: Path):
+        self.cmd = cmd
+        self.frames_written = 0
+        self._next = 0
+        self._ready: Dict[int, Optional[Path]] = {}
+        self._lock = threading.Lock()
+        self._broken = False
+        self._stderr_file = tempfile.TemporaryFile()
+        self._proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=self._stderr_file,
+            cwd=cwd
+        )
+    
+    def frame_done(self, index: int, frame_file: Optional[Path]) -> int:
+        """Hand over a finished frame (None if it failed); returns the number of frames released."""
+        released = 0
+        with self._lock:
+            self._ready[index] = frame_file
+            while self._next in self._ready:
+                frame_file = self._ready.pop(self._next)
+                if frame_file is not None:
+                    if not self._broken:
+                        try:
+                            _send_frame(self._proc.stdin, frame_file)
+                            self.frames_written += 1
+                        except BrokenPipeError:
+                            # FFmpeg exited early; finish() reports its error output
+                            self._broken = True
+                        except OSError as e:
+                            logger.warning(f"Failed to stream frame {self._next + 1}: {e}")
+                    try:
+                        frame_file.unlink(missing_ok=True)
+                    except OSError as e:
+                        logger.warning(f"Failed to delete streamed frame {frame_file}: {e}")
+                self._next += 1
+                released += 1
+        return released
+    
+    def finish(self, timeout: int = 600) -> Tuple[int, str]:
+        """Close FFmpeg's input and wait for it; returns (returncode, stderr)."""
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            returncode = self._proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+            raise
+        finally:
+            self._stderr_file.seek(0)
+            stderr = self._stderr_file.read().decode("utf-8", errors="replace")
+            self._stderr_file.close()
+        return returncode, stderr
+    
+    def abort(self) -> None:
+        """Stop FFmpeg without producing output and delete the frames still held."""
+        if self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+        self._stderr_file.close()
+        with self._lock:
+            for frame_file in self._ready.values():
+                if frame_file is not None:
+                    frame_file.unlink(missing_ok=True)
+            self._ready.clear()
+
 # Enhanced main application class
 class RayLM:
     """Enhanced RayLM application with comprehensive error handling and monitoring."""
@@ -788,9 +1897,36 @@ class RayLM:
         self.file_manager = FileManager(self.config)
         self.llm_client = LLMClient(self.config)
         self.renderer = POVRayRenderer(self.config)
+        self.scene_cache = LLMCache(self.config.scene_cache_dir) if self.config.cache_generations else None
+        self._frame_pool: Optional[ThreadPoolExecutor] = None  # Created on first animation, reused after
+        self._frame_pool_lock = threading.Lock()
         
         logger.info("RayLM v3.6 initialized successfully")
     
+    def _get_frame_pool(self) -> ThreadPoolExecutor:
+        """Return the frame render pool, creating it on first use.
+        
+        The pool outlives a single animation, so batch runs do not start and
+        join a fresh set of worker threads for every animated prompt. It is
+        sized to render_workers; shorter animations simply submit fewer frames.
+        """
+        with self._frame_pool_lock:
+            if self._frame_pool is None:
+                self._frame_pool = ThreadPoolExecutor(max_workers=max(1, self.config.render_workers),
+                                                      thread_name_prefix="raylm_frame")
+            return self._frame_pool
+    
+    def close(self) -> None:
+        """Shut down the frame render pool, dropping queued frames if the run was cancelled."""
+        if self._frame_pool is not None:
+            self._frame_pool.shutdown(wait=True, cancel_futures=_cancel_event.is_set())
+            self._frame_pool = None
+    
+    def __del__(self):
+        # Not guaranteed to run at interpreter exit; main() calls close() explicitly
+        if getattr(self, '_frame_pool', None) is not None:
+            self._frame_pool.shutdown(wait=False)
+    
     def _validate_configuration(self) -> None:
         """Validate the application configuration."""
         issues = self.config.validate()
@@ -802,17 +1938,9 @@ class RayLM:
     
     def _parse_resolution_preset(self, resolution: str) -> Tuple[int, int]:
         """Parse resolution preset to width and height."""
-        resolutions = {
-            "480p": (854, 480),
-            "720p": (1280, 720),
-            "1080p": (1920, 1080),
-            "1440p": (2560, 1440),
-            "4k": (3840, 2160)
-        }
-        
-        if resolution in resolutions:
-            return resolutions[resolution]
-        else:
+        try:
+            return _RESOLUTION_PRESETS[resolution]
+        except KeyError:
             raise RayLMValidationError(f"Unknown resolution preset: {resolution}")
     
     def _validate_dimensions(self, width: int, height: int) -> None:
@@ -827,70 +1955,169 @@ class RayLM:
     def _generate_animation_frames(self, scene_code: str, prompt: str, metrics: PerformanceMetrics,
                                   scene_file: Path, output_file: Path,
                                   width: int, height: int, quality: int,
-                                  timeout: int, fps: int, total_frames: int) -> List[Path]:
-        """Generate animation frames by varying the clock parameter."""
+                                  timeout: int, fps: int, total_frames: int,
+                                  encoder: Optional[_FrameStreamEncoder] = None) -> List[Path]:
+        """Generate animation frames by varying the clock parameter.
+        
+        With an encoder, frames are handed to it as they finish (and deleted
+        once encoded); the returned paths then no longer exist.
+        """
         logger.info(f"Generating animation with {total_frames} frames")
         
         if total_frames <= 0:
             raise ValueError("Number of frames must be positive")
+        # Same for every frame, so checked once, before any files are created
+        self._validate_dimensions(width, height)
         
         frame_files = []
-        temp_files = []  # Track temporary files for cleanup
+        # Per-frame scene files go in one per-run directory, removed in a single call
+        frame_dir = Path(tempfile.mkdtemp(prefix='raylm_anim_', dir=scene_file.parent))
         
         try:
-            for i in range(total_frames):
-                clock_value = i / max(1, (total_frames - 1))
-                print(f"   🎬 Frame {i+1:3d}/{total_frames} (clock={clock_value:.3f})...", end="", flush=True)
-                
-                # Create frame-specific filenames
-                frame_suffix = f"_frame_{i:03d}"
-                temp_scene_file = self.file_manager.create_scene_filename(
-                    prompt, timestamp=datetime.now().strftime("%Y%m%d_%H%M%S")
-                ).with_name(f"{scene_file.stem}{frame_suffix}.pov")
-                temp_ini_file = temp_scene_file.with_suffix(".ini")
-                frame_output_file = self.file_manager.create_output_filename(
-                    prompt, timestamp=datetime.now().strftime("%Y%m%d_%H%M%S")
-                ).with_name(f"{output_file.stem}{frame_suffix}.png")
+            # Frames are independent POV-Ray processes: split the cores between them,
+            # running no more at once than the available memory can hold
+            workers = max(1, min(self.config.render_workers, total_frames))
+            available = _available_memory()
+            if available is not None and self.config.frame_memory_mb > 0:
+                fits = max(1, available // (self.config.frame_memory_mb * 1024 * 1024))
+                if fits < workers:
+                    logger.warning(f"Only {available // (1024 * 1024)} MB available; "
+                                   f"rendering {fits} frames at once instead of {workers}")
+                    workers = fits
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            
+            # Locate the Clock declaration once; each frame is then a plain join
+            clock_template = _prepare_clock_template(scene_code)
+            
+            # Frames differ only in the Clock value, so validating one stands for all of them
+            is_valid, errors = ValidationSystem.validate_scene_code('#declare Clock = 0.0;'.join(clock_template))
+            if not is_valid:
+                logger.warning(f"Animated scene code validation failed: {errors}")
+            
+            # Clock values and their declarations are computed once for all frames
+            last_frame = max(1, total_frames - 1)
+            clock_values = [i / last_frame for i in range(total_frames)]
+            clock_lines = [f'#declare Clock = {clock};'.encode('utf-8') for clock in clock_values]
+            # The unchanging parts of the scene are encoded once, not once per frame
+            clock_template_bytes = [piece.encode('utf-8') for piece in clock_template]
+            
+            # Frame files are named after the scene and output file stems
+            scene_stem = scene_file.stem
+            output_stem, output_parent = output_file.stem, output_file.parent
+            
+            # Indexed by frame number, so the files come out in order without sorting
+            rendered: List[Optional[Path]] = [None] * total_frames
+            streamed_live = False
+            if self.config.cluster_backend == "ray":
+                if is_valid:
+                    rendered = self._render_frames_on_ray(clock_template_bytes, clock_values, clock_lines,
+                                                          output_parent, output_stem,
+                                                          width, height, quality, timeout)
+            elif workers == 1 and total_frames > 1:
+                # Frames are not rendered side by side, so use POV-Ray's own animation loop
+                if is_valid:
+                    rendered = self._render_frames_natively(clock_template_bytes, total_frames, frame_dir,
+                                                            scene_stem, output_parent, output_stem,
+                                                            width, height, quality, timeout)
+            else:
+                # Each frame is submitted as soon as its scene file is written, so POV-Ray
+                # starts on the first frames while later ones are still being prepared
+                print(f"   🎬 Rendering {total_frames} frames with {workers} parallel workers ({threads} threads each)...")
+                streamed_live = encoder is not None
+                progress = _FrameProgress(total_frames)
+                # Workers only post finished frames; one collector thread records them, reports
+                # progress and feeds the encoder, so no worker prints or waits on FFmpeg's pipe
+                finished: queue.SimpleQueue = queue.SimpleQueue()
+                # When streaming, each frame holds a slot until the encoder has consumed it,
+                # so at most max_pending_frames PNGs exist at once
+                pending_slots = threading.BoundedSemaphore(max(workers, self.config.max_pending_frames))
+                # The shared pool has render_workers threads; this keeps the number of
+                # POV-Ray processes at the (possibly memory-capped) worker count
+                running = threading.BoundedSemaphore(workers)
                 
-                temp_files.extend([temp_scene_file, temp_ini_file])
+                def _collect_frames() -> None:
+                    # Items are (index, frame file or None, error); None ends the run
+                    while True:
+                        item = finished.get()
+                        if item is None:
+                            return
+                        i, frame_output_file, error = item
+                        ok = frame_output_file is not None
+                        if ok:
+                            rendered[i] = frame_output_file
+                        else:
+                            logger.warning(f"Failed to render frame {i+1}{': ' + error if error else ''}")
+                        progress.frame_done(i, ok, error)
+                        if encoder:
+                            for _ in range(encoder.frame_done(i, frame_output_file)):
+                                pending_slots.release()
                 
-                # Inject clock value into scene code
-                animated_scene_code = self._inject_clock_value(scene_code, clock_value)
+                def _render_frame(i: int, scene: Path, output: Path, options: List[str]) -> None:
+                    try:
+                        ok = self.renderer.render_scene(scene, output, options, timeout, None, True)
+                    except Exception as e:
+                        finished.put((i, None, str(e)))
+                    else:
+                        finished.put((i, output if ok else None, ""))
+                    finally:
+                        running.release()
                 
-                # Validate the animated scene code
-                is_valid, errors = ValidationSystem.validate_scene_code(animated_scene_code)
-                if not is_valid:
-                    print(f" ⚠️  (validation failed)")
-                    logger.warning(f"Frame {i+1} code validation failed: {errors}")
-                    continue
+                collector = threading.Thread(target=_collect_frames, name="raylm_frame_collector", daemon=True)
+                collector.start()
                 
+                pool = self._get_frame_pool()
+                futures = []
+                # Only file names and the clock differ between frames, so directories are
+                # created and resolved once, and the shared options are built once. Frame
+                # scene files are written just before use, so they are not stat'ed again.
+                output_parent.mkdir(parents=True, exist_ok=True)
+                input_prefix = f"+I{frame_dir.resolve() / scene_stem}"
+                output_prefix = f"+O{output_parent.resolve() / output_stem}"
+                frame_settings = POVRayRenderer.render_settings(width, height, quality, threads=threads)
                 try:
-                    # Write scene file
-                    with open(temp_scene_file, "w") as f:
-                        f.write(animated_scene_code)
-                    
-                    # Create INI file with clock parameter
-                    self._validate_dimensions(width, height)
-                    ini_file = self.renderer.create_ini_file(
-                        temp_scene_file, frame_output_file, 
-                        width, height, quality,
-                        clock_value=clock_value
-                    )
-                    
-                    # Render the frame
-                    render_start = time.time()
-                    if self.renderer.render_scene(temp_scene_file, frame_output_file, ini_file, timeout):
-                        frame_time = time.time() - render_start
-                        print(f" ✅ ({frame_time:.1f}s)")
-                        frame_files.append(frame_output_file)
-                    else:
-                        print(f" ❌")
-                        logger.warning(f"Failed to render frame {i+1}")
+                    for i in range(total_frames if is_valid else 0):
+                        if _cancel_event.is_set():
+                            break
+                        if encoder:
+                            pending_slots.acquire()
+                        clock_value = clock_values[i]
                         
-                except Exception as e:
-                    print(f" ❌ ({e})")
-                    logger.error(f"Error rendering frame {i+1}: {e}")
-                    
+                        # Create frame-specific filenames
+                        frame_suffix = f"_frame_{i:03d}"
+                        temp_scene_file = frame_dir / f"{scene_stem}{frame_suffix}.pov"
+                        frame_output_file = output_parent / f"{output_stem}{frame_suffix}.png"
+                        
+                        # Inject clock value into scene code
+                        animated_scene_code = clock_lines[i].join(clock_template_bytes)
+                        
+                        try:
+                            # Write scene file (bytes, so a single write with no text-layer work)
+                            temp_scene_file.write_bytes(animated_scene_code)
+                        except Exception as e:
+                            logger.error(f"Error preparing frame {i+1}: {e}")
+                            finished.put((i, None, str(e)))
+                            continue
+                        
+                        # Render options with clock parameter
+                        render_options = [f"{input_prefix}{frame_suffix}.pov",
+                                          f"{output_prefix}{frame_suffix}.png",
+                                          *frame_settings, f"+K{clock_value}"]
+                        running.acquire()
+                        futures.append(pool.submit(_render_frame, i, temp_scene_file,
+                                                   frame_output_file, render_options))
+                finally:
+                    # The pool stays up for the next animation; only this run's frames are awaited
+                    wait(futures)
+                    finished.put(None)
+                    collector.join()
+                progress.close()
+            
+            if encoder and not streamed_live:
+                # These paths return all frames at the end; hand them over in order
+                for i in range(total_frames):
+                    encoder.frame_done(i, rendered[i])
+            
+            frame_files = [path for path in rendered if path is not None]
             logger.info(f"Animation generation completed. Successfully rendered {len(frame_files)}/{total_frames} frames.")
             return frame_files
             
@@ -898,34 +2125,97 @@ class RayLM:
             logger.error(f"Animation generation failed: {e}")
             raise
         finally:
-            # Clean up temporary files
-            for temp_file in temp_files:
-                try:
-                    if temp_file.exists():
-                        temp_file.unlink()
-                        logger.debug(f"Cleaned up temporary file: {temp_file}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up {temp_file}: {e}")
+            # Clean up temporary frame scene files
+            shutil.rmtree(frame_dir, ignore_errors=True)
+            logger.debug(f"Cleaned up temporary frame directory: {frame_dir}")
+    
+    def _render_frames_natively(self, scene_pieces: List[bytes], total_frames: int, frame_dir: Path,
+                                scene_stem: str, output_parent: Path, output_stem: str,
+                                width: int, height: int, quality: int, timeout: int) -> List[Optional[Path]]:
+        """Render all frames in one POV-Ray process with its built-in animation loop.
+        
+        Clock is declared from POV-Ray's own clock variable, so a single scene
+        file serves every frame and POV-Ray numbers the output files itself.
+        This saves a process start-up and include loading per frame.
+        """
+        frames_scene = frame_dir / f"{scene_stem}_frames.pov"
+        frames_scene.write_bytes(b'#declare Clock = clock;'.join(scene_pieces))
+        
+        # POV-Ray inserts the frame number before the extension, padded to the width of the last one
+        output_prefix = output_parent / f"{output_stem}_frame_.png"
+        last_frame = output_parent / f"{output_stem}_frame_{total_frames - 1}.png"
+        render_options = self.renderer.build_render_options(frames_scene, output_prefix, width, height, quality)
+        render_options += ["+KFI0", f"+KFF{total_frames - 1}", "+KI0", "+KF1"]
+        
+        print(f"   🎬 Rendering {total_frames} frames in a single POV-Ray animation run...")
+        try:
+            self.renderer.render_scene(frames_scene, last_frame, render_options, timeout * total_frames)
+        except RayLMError as e:
+            print(f"   🎬 Animation run failed ({e})")
+            logger.error(f"Error rendering animation frames: {e}")
+        
+        # Collect whatever frames were written, even if the run stopped part-way;
+        # the names are known up front, so one directory listing answers for all of them
+        pad = len(str(total_frames - 1))
+        with os.scandir(output_parent) as entries:
+            present = {entry.name for entry in entries}
+        rendered: List[Optional[Path]] = [None] * total_frames
+        for i in range(total_frames):
+            name = f"{output_stem}_frame_{i:0{pad}d}.png"
+            if name in present:
+                rendered[i] = output_parent / name
+        return rendered
+    
+    def _render_frames_on_ray(self, scene_pieces: List[bytes], clock_values: List[float],
+                              clock_lines: List[bytes], output_parent: Path, output_stem: str,
+                              width: int, height: int, quality: int, timeout: int) -> List[Optional[Path]]:
+        """Render animation frames as Ray tasks spread across a cluster.
+        
+        The scene is shipped once to the object store; each task renders one
+        frame in its worker's temp directory and returns the PNG bytes, which
+        are written next to the other renders. Frames are collected with
+        ray.wait, so slow nodes do not hold up the frames already finished.
+        """
+        try:
+            import ray  # Optional: only needed for --cluster ray
+        except ImportError:
+            raise RayLMConfigurationError("Cluster rendering requires the 'ray' package (pip install ray)")
+        
+        if not ray.is_initialized():
+            ray.init(address=self.config.cluster_address)
+        remote_render = ray.remote(num_cpus=1)(_render_frame_remote)
+        scene_ref = ray.put(scene_pieces)
+        # Options shared by every frame are built and shipped once; tasks differ only in the clock.
+        # One CPU per task, so POV-Ray is limited to a single thread.
+        settings_ref = ray.put(POVRayRenderer.render_settings(width, height, quality, threads=1))
+        
+        total_frames = len(clock_values)
+        print(f"   🎬 Rendering {total_frames} frames on the Ray cluster...")
+        pending = {}
+        for i, clock_value in enumerate(clock_values):
+            ref = remote_render.remote(scene_ref, clock_lines[i], settings_ref, f"+K{clock_value}", timeout)
+            pending[ref] = (i, output_parent / f"{output_stem}_frame_{i:03d}.png")
+        
+        rendered: List[Optional[Path]] = [None] * total_frames
+        progress = _FrameProgress(total_frames)
+        refs = list(pending)
+        while refs:
+            done, refs = ray.wait(refs, num_returns=1)
+            i, frame_output_file = pending[done[0]]
+            try:
+                frame_output_file.write_bytes(ray.get(done[0]))
+                rendered[i] = frame_output_file
+                progress.frame_done(i, True)
+            except Exception as e:
+                progress.frame_done(i, False, str(e))
+                logger.error(f"Error rendering frame {i+1} on the cluster: {e}")
+        progress.close()
+        
+        return rendered
     
     def _inject_clock_value(self, scene_code: str, clock_value: float) -> str:
         """Inject clock value into POV-Ray scene code."""
-        # Look for existing clock declaration and replace it
-        clock_pattern = r'#declare\s+Clock\s*=\s*[^;]+;'
-        if re.search(clock_pattern, scene_code, re.IGNORECASE):
-            # Replace existing clock declaration
-            scene_code = re.sub(clock_pattern, f'#declare Clock = {clock_value};', scene_code, flags=re.IGNORECASE)
-        else:
-            # Add clock declaration after includes
-            include_end = scene_code.find('\n\n')
-            if include_end == -1:
-                include_end = scene_code.find('\n')
-            if include_end != -1:
-                scene_code = scene_code[:include_end] + f'\n#declare Clock = {clock_value};' + scene_code[include_end:]
-            else:
-                # Fallback: prepend clock declaration
-                scene_code = f'#declare Clock = {clock_value};\n' + scene_code
-        
-        return scene_code
+        return f'#declare Clock = {clock_value};'.join(_prepare_clock_template(scene_code))
     
     def generate_scene(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Generate a POV-Ray scene with comprehensive error handling."""
@@ -933,7 +2223,7 @@ class RayLM:
         print(f"\n🚀 Starting RayLM v3.6 scene generation...")
         print(f"📝 Prompt: {prompt[:80]}{'...' if len(prompt) > 80 else ''}")
         
-        metrics = PerformanceMetrics("scene_generation")
+        metrics = kwargs.get('metrics') or PerformanceMetrics("scene_generation")
         
         try:
             # Validate prompt
@@ -979,20 +2269,49 @@ class RayLM:
                 print(f"   Resolution: {width}x{height}, Quality: {quality}")
                 print(f"   Timeout: {timeout}s, Timeout: {timeout}s")
             
+            # Checked before the generator call, so bad settings do not cost an API round-trip
+            if not no_render:
+                self._validate_dimensions(width, height)
+            if animate and (fps <= 0 or (frames or duration * fps) <= 0):
+                raise RayLMValidationError(f"Invalid animation length: {frames or duration * fps} frames at {fps} FPS")
+            
             if animate:
                 print(f"   Animation: {frames or duration*fps} frames at {fps} FPS")
+                # Start the frame pool and run the FFmpeg probes while the model is generating,
+                # so neither is on the critical path once frames are ready
+                pool = self._get_frame_pool()
+                pool.submit(_ffmpeg_available)
+                if self.config.hw_encode:
+                    pool.submit(_ffmpeg_encoders)
             
             print("✅ Configuration complete")
             
             # Generate scene code
             print("\n🎨 AI Scene Generation Phase")
             print("=" * 50)
-            scene_code = self.llm_client.generate_scene_code(prompt, metrics)
+            scene_code = kwargs.get('scene_code')
+            scene_key = None
+            scene_cached = False
+            if scene_code is None and self.scene_cache is not None:
+                scene_key = LLMCache.scene_key(prompt, self.config)
+                scene_code = self.scene_cache.get(scene_key)
+                scene_cached = scene_code is not None
+                if scene_cached:
+                    print("⚡ Using cached scene for this prompt")
+                    logger.info("Scene served from scene cache")
+                    metrics.metadata['scene_cache_hit'] = True
+            if scene_code is None:
+                scene_code = self.llm_client.run_sync(self.llm_client.generate_scene_code(prompt, metrics))
+            elif not scene_cached:
+                print("✅ Using scene code from batch generation")
+            
+            # Validate generated code locally; this decides whether the verifier is needed
+            # (generate_scene_code has already applied fix_common_issues)
+            is_valid, errors = ValidationSystem.validate_scene_code(scene_code)
+            locally_valid = is_valid and ValidationSystem.has_required_structure(scene_code)
             
-            # Validate generated code
             if self.config.validate_syntax:
                 print("🔍 Validating generated scene code...", end="", flush=True)
-                is_valid, errors = ValidationSystem.validate_scene_code(scene_code)
                 if not is_valid:
                     print(f" ⚠️  (found {len(errors)} issues)")
                     for error in errors:
@@ -1005,23 +2324,41 @@ class RayLM:
             scene_file = self.file_manager.create_scene_filename(prompt, timestamp)
             output_file = self.file_manager.create_output_filename(prompt, timestamp)
             
+            # Verify scene code only when local validation failed (saves a round-trip).
+            # The request starts now, so saving the draft overlaps with the network wait.
+            verify_future = None
+            pre_verified = kwargs.get('verified', False)
+            if self.config.verifier_model and not scene_cached and not pre_verified and not locally_valid:
+                verification_start = time.time()
+                verify_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="raylm_verify")
+                verify_future = verify_pool.submit(
+                    self.llm_client.run_sync, self.llm_client.verify_scene_code(scene_code, prompt, metrics, quiet=True)
+                )
+                verify_pool.shutdown(wait=False)
+            
             print(f"\n💾 File Management Phase")
             print("=" * 50)
             
-            # Save scene code
-            print(f"💾 Saving scene code to {scene_file.name}...", end="", flush=True)
-            with open(scene_file, 'w') as f:
-                f.write(scene_code)
-            print(" ✅")
-            
-            # Create backup if enabled
-            if self.config.backup_generations:
-                print(f"🛡️  Creating backup...", end="", flush=True)
-                backup_file = self.file_manager.backup_scene(scene_code, scene_file)
-                if backup_file:
-                    print(f" ✅ ({backup_file.name})")
-                else:
-                    print(" ⚠️  (backup failed)")
+            try:
+                # Save scene code
+                print(f"💾 Saving scene code to {scene_file.name}...", end="", flush=True)
+                scene_file.write_bytes(scene_code.encode('utf-8'))
+                print(" ✅")
+                
+                # Create backup if enabled
+                backup_file = None
+                if self.config.backup_generations:
+                    print(f"🛡️  Creating backup...", end="", flush=True)
+                    backup_file = self.file_manager.backup_scene(scene_code, scene_file)
+                    if backup_file:
+                        print(f" ✅ ({backup_file.name})")
+                    else:
+                        print(" ⚠️  (backup failed)")
+            except BaseException:
+                # Let the verifier finish with the shared event loop before it can be closed
+                if verify_future is not None:
+                    wait([verify_future])
+                raise
             
             metrics.metadata['scene_file'] = str(scene_file)
             metrics.metadata['output_file'] = str(output_file)
@@ -1039,24 +2376,29 @@ class RayLM:
                 'animate': animate
             }
             
-            # Verify scene code
-            if self.config.verifier_model:
+            metrics.metadata['single_call'] = locally_valid or not self.config.verifier_model
+            if self.config.verifier_model and scene_cached:
+                logger.info("Cached scene was already verified; verifier call skipped")
+            elif self.config.verifier_model and pre_verified:
+                logger.info("Scene was verified during batch generation; verifier call skipped")
+            elif self.config.verifier_model and locally_valid:
+                print(f"\n⏭️  Skipping AI verification (local validation passed)")
+                logger.info("Local validation passed; verifier call skipped")
+            elif self.config.verifier_model:
                 print(f"\n🔍 AI Verification Phase")
                 print("=" * 50)
                 try:
-                    print(f"🔄 Running verification with {self.config.verifier_model}...")
-                    verification_start = time.time()
-                    
-                    print("⏳ Contacting verification model...", end="", flush=True)
-                    scene_code = self.llm_client.verify_scene_code(scene_code, prompt, metrics)
+                    print(f"🔄 Waiting for verification with {self.config.verifier_model}...", end="", flush=True)
+                    verified_code = verify_future.result()
                     verification_time = time.time() - verification_start
-                    
-                    # Save verified code
                     print(f" ✅ ({verification_time:.1f}s)")
-                    print(f"💾 Saving verified scene code...", end="", flush=True)
-                    with open(scene_file, 'w') as f:
-                        f.write(scene_code)
-                    print(" ✅")
+                    
+                    # Save verified code (the draft is already on disk if nothing changed)
+                    if verified_code != scene_code:
+                        scene_code = verified_code
+                        print(f"💾 Saving verified scene code...", end="", flush=True)
+                        scene_file.write_bytes(scene_code.encode('utf-8'))
+                        print(" ✅")
                     
                     metrics.metadata['verification_time'] = verification_time
                     logger.info(f"Scene code verified and updated ({verification_time:.2f}s)")
@@ -1066,6 +2408,10 @@ class RayLM:
                     logger.warning(f"Scene verification failed: {e}")
                     metrics.metadata['verification_error'] = str(e)
             
+            # Only scenes that got through verification are cached, since hits skip the verifier
+            if scene_key is not None and not scene_cached and 'verification_error' not in metrics.metadata:
+                self.scene_cache.set(scene_key, scene_code)
+            
             if no_render:
                 print(f"\n✅ Code generation completed (no rendering)")
                 metrics.complete()
@@ -1082,12 +2428,41 @@ class RayLM:
                 print("=" * 50)
                 
                 frames = frames or (duration * fps)
-                frame_files = self._generate_animation_frames(
-                    scene_code, prompt, metrics, scene_file, output_file, 
-                    width, height, quality, timeout, fps, frames
+                animation_output = self.file_manager.create_output_filename(
+                    prompt, timestamp, extension="mp4"
                 )
                 
+                # Optionally start FFmpeg now and feed it frames as they finish
+                encoder = None
+                if self.config.stream_frames:
+                    # A streamed encode cannot fall back to another encoder once frames
+                    # are consumed, so a hardware encoder is only used if it passes a probe
+                    encoder_name, encoder_args = next(
+                        enc for enc in self._encoder_candidates()
+                        if enc is _CPU_ENCODER or _hw_encoder_works(enc[0])
+                    )
+                    try:
+                        encoder = _FrameStreamEncoder(
+                            self._ffmpeg_command(encoder_args, fps, animation_output), animation_output.parent
+                        )
+                        print(f"🎥 Encoding frames with {encoder_name} while rendering")
+                        metrics.metadata['encoder'] = encoder_name
+                    except OSError as e:
+                        logger.warning(f"Could not start FFmpeg for streaming ({e}); encoding after rendering")
+                
+                try:
+                    frame_files = self._generate_animation_frames(
+                        scene_code, prompt, metrics, scene_file, output_file, 
+                        width, height, quality, timeout, fps, frames, encoder
+                    )
+                except BaseException:
+                    if encoder:
+                        encoder.abort()
+                    raise
+                
                 if not frame_files:
+                    if encoder:
+                        encoder.abort()
                     print(f"❌ No frames were generated")
                     metrics.complete("No frames generated")
                     return {
@@ -1097,14 +2472,16 @@ class RayLM:
                     }
                 
                 # Render animation
-                animation_output = self.file_manager.create_output_filename(
-                    prompt, timestamp, extension="mp4"
-                )
-                
-                print(f"🎬 Creating animation from {len(frame_files)} frames...")
-                animation_success = self.render_animation(
-                    frame_files, animation_output, fps, metrics
-                )
+                if encoder:
+                    print(f"🎬 Finishing animation from {encoder.frames_written} frames...")
+                    animation_success = self._finish_streamed_animation(
+                        encoder, animation_output, fps, len(frame_files), metrics
+                    )
+                else:
+                    print(f"🎬 Creating animation from {len(frame_files)} frames...")
+                    animation_success = self.render_animation(
+                        frame_files, animation_output, fps, metrics
+                    )
                 
                 if animation_success:
                     print(f"\n🎉 Animation generation completed successfully!")
@@ -1137,11 +2514,11 @@ class RayLM:
             
             self._validate_dimensions(width, height)
             
-            ini_file = self.renderer.create_ini_file(
+            render_options = self.renderer.build_render_options(
                 scene_file, output_file, width, height, quality
             )
             
-            success = self.renderer.render_scene(scene_file, output_file, ini_file, timeout, render_metrics)
+            success = self.renderer.render_scene(scene_file, output_file, render_options, timeout, render_metrics)
             
             if success:
                 print(f"\n🎉 Generation completed successfully!")
@@ -1172,25 +2549,195 @@ class RayLM:
             metrics.complete(str(e))
             raise
     
+    def batch_render(self, prompts: List[str], overrides: Optional[List[Dict[str, Any]]] = None,
+                     **kwargs) -> List[Dict[str, Any]]:
+        """Generate and render several prompts, with all LLM requests in flight at once.
+        
+        Scene code for every valid prompt is generated and, where needed,
+        verified concurrently (bounded by config.max_concurrency); rendering
+        then runs per scene. overrides[i], if given, holds generate_scene
+        options for prompts[i] that take precedence over kwargs.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(prompts)
+        params_list: List[Dict[str, Any]] = []
+        valid = []
+        
+        for i, prompt in enumerate(prompts):
+            params = kwargs
+            if overrides and overrides[i]:
+                params = dict(kwargs)
+                if 'resolution' in overrides[i] and not overrides[i].keys() & {'width', 'height'}:
+                    # A preset given for this prompt replaces the shared dimensions
+                    params['width'] = params['height'] = None
+                params.update(overrides[i])
+            params_list.append(params)
+            
+            is_valid, errors = ValidationSystem.validate_prompt(prompt)
+            if not is_valid:
+                logger.error(f"Skipping invalid prompt #{i + 1}: {errors}")
+                results[i] = {'success': False, 'error': f"Invalid prompt: {errors}"}
+                continue
+            # Explicit dimensions are checked here too, so a bad one costs no generator call
+            if (not params.get('no_render') and not params.get('preview')
+                    and params.get('width') is not None and params.get('height') is not None):
+                is_valid, errors = ValidationSystem.validate_resolution(params['width'], params['height'])
+                if not is_valid:
+                    logger.error(f"Skipping prompt #{i + 1} with invalid resolution: {errors}")
+                    results[i] = {'success': False, 'error': f"Invalid resolution: {errors}"}
+                    continue
+            valid.append(i)
+        
+        print(f"\n🚀 Generating {len(valid)} scenes (up to {self.config.max_concurrency} at once)...")
+        metrics_list = [PerformanceMetrics("scene_generation") for _ in valid]
+        valid_prompts = [prompts[i] for i in valid]
+        codes = None
+        
+        if self.config.batch_single_request and len(valid_prompts) > 1:
+            batch_metrics = PerformanceMetrics("batch_generation")
+            try:
+                codes = self.llm_client.run_sync(
+                    self.llm_client.generate_scene_codes_batch(valid_prompts, batch_metrics)
+                )
+            except RayLMAPIError as e:
+                logger.warning(f"Single-request batch failed, falling back to concurrent requests: {e}")
+        
+        verified = False
+        if codes is None:
+            # Verification runs in the same coroutines, overlapping with other prompts' generation
+            codes = self.llm_client.run_sync(
+                self.llm_client.generate_many(valid_prompts, metrics_list, verify=True)
+            )
+            verified = True
+        
+        for i, code, metrics in zip(valid, codes, metrics_list):
+            if isinstance(code, Exception):
+                metrics.complete(str(code))
+                results[i] = {'success': False, 'error': str(code), 'metrics': metrics}
+                continue
+            try:
+                results[i] = self.generate_scene(prompts[i], scene_code=code, metrics=metrics,
+                                                 verified=verified, **params_list[i])
+            except RayLMError as e:
+                results[i] = {'success': False, 'error': str(e), 'metrics': metrics}
+        
+        return results
+    
+    def _batch_manifest(self, batch_id: str) -> Path:
+        """Path of the custom_id -> prompt mapping saved for a submitted batch."""
+        return self.config.output_dir / "batches" / f"{batch_id}.json"
+    
+    def submit_batch(self, prompts: List[str]) -> str:
+        """Submit prompts to the Batch API for offline generation and return the batch id."""
+        for i, prompt in enumerate(prompts):
+            is_valid, errors = ValidationSystem.validate_prompt(prompt)
+            if not is_valid:
+                raise RayLMValidationError(f"Invalid prompt #{i + 1}: {errors}")
+        
+        batch_id, id_map = self.llm_client.run_sync(self.llm_client.submit_batch(prompts))
+        
+        manifest = self._batch_manifest(batch_id)
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        with open(manifest, "w", encoding="utf-8") as f:
+            json.dump(id_map, f, indent=2)
+        
+        print(f"📤 Submitted batch {batch_id} ({len(prompts)} prompts)")
+        print(f"   Collect with: --collect-batch {batch_id}")
+        return batch_id
+    
+    def wait_batch(self, batch_id: str, **kwargs) -> List[Dict[str, Any]]:
+        """Wait for a submitted batch, save its scenes and render them in a thread pool."""
+        manifest = self._batch_manifest(batch_id)
+        if not manifest.exists():
+            raise RayLMValidationError(f"No manifest for batch {batch_id}: {manifest}")
+        with open(manifest, encoding="utf-8") as f:
+            id_map = json.load(f)
+        
+        print(f"⏳ Waiting for batch {batch_id}...")
+        batch = self.llm_client.run_sync(self.llm_client.poll_batch(batch_id))
+        print(f"📥 Batch {batch.status}")
+        codes = self.llm_client.run_sync(self.llm_client.fetch_batch_results(batch))
+        
+        width = kwargs.get('width') or self.config.default_width
+        height = kwargs.get('height') or self.config.default_height
+        quality = kwargs.get('quality') or self.config.default_quality
+        timeout = kwargs.get('timeout') or self.config.default_timeout
+        no_render = kwargs.get('no_render', False)
+        self._validate_dimensions(width, height)
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        jobs = []
+        results = []
+        for n, (custom_id, prompt) in enumerate(id_map.items()):
+            code = codes.get(custom_id, RayLMAPIError("Missing from batch output"))
+            if isinstance(code, Exception):
+                results.append({'success': False, 'error': str(code)})
+                continue
+            
+            scene_file = self.file_manager.create_scene_filename(prompt, timestamp)
+            scene_file = scene_file.with_name(f"{scene_file.stem}_{n}.pov")
+            output_file = self.file_manager.create_output_filename(prompt, timestamp)
+            output_file = output_file.with_name(f"{output_file.stem}_{n}{output_file.suffix}")
+            scene_file.write_bytes(code.encode('utf-8'))
+            
+            result = {'success': True, 'scene_file': scene_file, 'scene_code': code}
+            results.append(result)
+            if not no_render:
+                jobs.append((result, scene_file, output_file))
+        
+        def _render(job):
+            result, scene_file, output_file = job
+            metrics = PerformanceMetrics("scene_rendering")
+            try:
+                render_options = self.renderer.build_render_options(scene_file, output_file, width, height, quality,
+                                                                    threads=threads)
+                ok = self.renderer.render_scene(scene_file, output_file, render_options, timeout, metrics,
+                                                quiet=True)
+            except RayLMError as e:
+                ok = False
+                metrics.complete(str(e))
+            result['success'] = ok
+            result['metrics'] = metrics
+            if ok:
+                result['output_file'] = output_file
+            else:
+                result['error'] = metrics.error or "Rendering failed"
+        
+        workers = max(1, min(self.config.max_concurrency, len(jobs)))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_render, jobs))
+        
+        return results
+    
     def render_animation(self, frame_files: List[Path], output_path: Path, fps: int,
                         metrics: Optional[PerformanceMetrics] = None) -> bool:
-        """Render animation from frames using FFmpeg."""
+        """Render animation from frames using FFmpeg.
+        
+        frame_files must already be in frame order; they are piped as given.
+        """
         
         if not frame_files:
             logger.error("No frame files to render")
             return False
         
         # Check FFmpeg availability
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, timeout=10, check=True)
+        if _ffmpeg_available():
             print("✅ FFmpeg available")
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        else:
             print("❌ FFmpeg not found. Cannot create animation.")
             logger.error("FFmpeg not found. Cannot create animation.")
             return False
         
-        # Validate frame files exist
-        missing_files = [f for f in frame_files if not f.exists()]
+        # Validate frame files exist: one directory listing per parent instead
+        # of a stat per frame (expensive on network filesystems)
+        present: Dict[Path, set] = {}
+        for parent in {f.parent for f in frame_files}:
+            try:
+                with os.scandir(parent) as entries:
+                    present[parent] = {entry.name for entry in entries}
+            except OSError:
+                present[parent] = set()
+        missing_files = [f for f in frame_files if f.name not in present[f.parent]]
         if missing_files:
             print(f"❌ Missing frame files: {missing_files}")
             logger.error(f"Missing frame files: {missing_files}")
@@ -1199,33 +2746,9 @@ class RayLM:
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Create frame list file for FFmpeg
-        temp_list_file = output_path.with_suffix(".txt")
-        
-        print(f"📝 Creating frame list...", end="", flush=True)
-        with open(temp_list_file, "w") as f:
-            for frame_file in sorted(frame_files):
-                f.write(f"file '{frame_file.name}'\n")
-                f.write(f"duration {1/fps}\n")
-            # Add the last frame again to close the sequence
-            f.write(f"file '{frame_files[-1].name}'\n")
-        print(" ✅")
-        
-        # Enhanced FFmpeg command with better quality settings
-        cmd = [
-            "ffmpeg",
-            "-y",  # Overwrite output file
-            "-f", "concat",
-            "-safe", "0",
-            "-i", str(temp_list_file),
-            "-c:v", "libx264",
-            "-preset", "medium",  # Balance between speed and quality
-            "-crf", "23",  # Quality level (lower = better quality)
-            "-pix_fmt", "yuv420p",  # Compatibility
-            "-vf", f"fps={fps}",
-            "-movflags", "+faststart",  # For better web compatibility
-            str(output_path)
-        ]
+        # Hardware encoders can be listed yet unusable (no GPU/driver), so each
+        # candidate falls back to the next one and finally to libx264
+        encoders = self._encoder_candidates()
         
         start_time = time.time()
         
@@ -1233,25 +2756,25 @@ class RayLM:
             print(f"🎥 Starting FFmpeg encoding...")
             print(f"   This may take several minutes...")
             
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=600,  # 10 minutes timeout
-                cwd=output_path.parent
-            )
+            for encoder, encoder_args in encoders:
+                cmd = self._ffmpeg_command(encoder_args, fps, output_path)
+                logger.info(f"Encoding animation with {encoder}")
+                returncode, stderr = self._pipe_frames_to_ffmpeg(cmd, frame_files, output_path.parent)
+                if returncode == 0 or encoder == _CPU_ENCODER[0]:
+                    break
+                logger.warning(f"Encoder {encoder} failed (error code {returncode}); trying the next one")
             
             render_time = time.time() - start_time
             
-            # Clean up frame list file
-            temp_list_file.unlink(missing_ok=True)
-            
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"✅ Animation rendered successfully!")
                 logger.info(f"Animation rendered successfully in {render_time:.2f}s: {output_path}")
                 
-                if output_path.exists():
+                try:
                     file_size = output_path.stat().st_size
+                except FileNotFoundError:
+                    pass
+                else:
                     print(f"📁 Animation: {output_path.name} ({file_size / (1024*1024):.1f} MB)")
                     logger.info(f"Animation file size: {file_size / (1024*1024):.2f} MB")
                     
@@ -1260,17 +2783,18 @@ class RayLM:
                         metrics.metadata['output_size'] = file_size
                         metrics.metadata['frame_count'] = len(frame_files)
                         metrics.metadata['fps'] = fps
+                        metrics.metadata['encoder'] = encoder
                 
                 return True
                 
             else:
-                print(f"❌ Animation rendering failed (error code {result.returncode})")
-                logger.error(f"Animation rendering failed with error code {result.returncode}")
+                print(f"❌ Animation rendering failed (error code {returncode})")
+                logger.error(f"Animation rendering failed with error code {returncode}")
                 logger.error(f"Command: {' '.join(cmd)}")
-                logger.error(f"Error output: {result.stderr}")
+                logger.error(f"Error output: {stderr}")
                 
                 if metrics:
-                    metrics.complete(f"FFmpeg error code {result.returncode}: {result.stderr}")
+                    metrics.complete(f"FFmpeg error code {returncode}: {stderr}")
                 
                 return False
                 
@@ -1278,7 +2802,6 @@ class RayLM:
             error_msg = "Animation rendering timed out after 600 seconds"
             print(f"❌ {error_msg}")
             logger.error(error_msg)
-            temp_list_file.unlink(missing_ok=True)
             
             if metrics:
                 metrics.complete(error_msg)
@@ -1286,11 +2809,115 @@ class RayLM:
             return False
             
         except Exception as e:
-            print(f"❌ Failed to create frame list or run FFmpeg: {e}")
-            logger.error(f"Failed to create frame list or run FFmpeg: {e}")
-            temp_list_file.unlink(missing_ok=True)
+            print(f"❌ Failed to stream frames to FFmpeg: {e}")
+            logger.error(f"Failed to stream frames to FFmpeg: {e}")
             return False
     
+    def _finish_streamed_animation(self, encoder: _FrameStreamEncoder, output_path: Path, fps: int,
+                                   frame_count: int, metrics: Optional[PerformanceMetrics] = None) -> bool:
+        """Wait for a streaming FFmpeg encode to finish and report the result."""
+        try:
+            returncode, stderr = encoder.finish()
+        except subprocess.TimeoutExpired:
+            error_msg = "Animation encoding timed out after 600 seconds"
+            print(f"❌ {error_msg}")
+            logger.error(error_msg)
+            if metrics:
+                metrics.complete(error_msg)
+            return False
+        
+        file_size = None
+        if returncode == 0:
+            try:
+                file_size = output_path.stat().st_size
+            except FileNotFoundError:
+                pass
+        if file_size is None:
+            print(f"❌ Animation rendering failed (error code {returncode})")
+            logger.error(f"Animation rendering failed with error code {returncode}")
+            logger.error(f"Command: {' '.join(encoder.cmd)}")
+            logger.error(f"Error output: {stderr}")
+            if metrics:
+                metrics.complete(f"FFmpeg error code {returncode}: {stderr}")
+            return False
+        
+        print(f"✅ Animation rendered successfully!")
+        print(f"📁 Animation: {output_path.name} ({file_size / (1024*1024):.1f} MB)")
+        logger.info(f"Animation rendered while streaming {encoder.frames_written} frames: {output_path}")
+        if metrics:
+            metrics.metadata['output_size'] = file_size
+            metrics.metadata['frame_count'] = frame_count
+            metrics.metadata['fps'] = fps
+        return True
+    
+    def _encoder_candidates(self) -> List[Tuple[str, List[str]]]:
+        """Encoders to try, best first; libx264 is always last."""
+        encoders = []
+        if self.config.hw_encode:
+            available = _ffmpeg_encoders()
+            encoders = [enc for enc in _HW_ENCODERS if enc[0] in available]
+        encoders.append(_CPU_ENCODER)
+        return encoders
+    
+    @staticmethod
+    def _ffmpeg_command(encoder_args: List[str], fps: int, output_path: Path) -> List[str]:
+        """FFmpeg command that encodes a PNG stream read from stdin."""
+        # Frames are fed to FFmpeg's stdin as a PNG stream, so no list file is
+        # written and FFmpeg does not re-read the frames from disk
+        return [
+            "ffmpeg",
+            "-y",  # Overwrite output file
+            "-f", "image2pipe",
+            "-c:v", "png",
+            "-framerate", str(fps),
+            "-i", "pipe:0",
+            *encoder_args,
+            "-movflags", "+faststart",  # For better web compatibility
+            str(output_path)
+        ]
+    
+    def _pipe_frames_to_ffmpeg(self, cmd: List[str], frame_files: List[Path],
+                               cwd: Path, timeout: int = 600) -> Tuple[int, str]:
+        """Run FFmpeg, writing the frames to its stdin; returns (returncode, stderr)."""
+        # stderr goes to a temp file: a full pipe would stall FFmpeg while we write stdin
+        with tempfile.TemporaryFile() as stderr_file:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr_file,
+                cwd=cwd
+            )
+            timed_out = threading.Event()
+            
+            def _on_timeout():
+                timed_out.set()
+                proc.kill()
+            
+            timer = threading.Timer(timeout, _on_timeout)
+            timer.daemon = True
+            timer.start()
+            try:
+                for frame_file in frame_files:
+                    _send_frame(proc.stdin, frame_file)
+                proc.stdin.close()
+                returncode = proc.wait()
+            except BrokenPipeError:
+                # FFmpeg exited early; its stderr explains why
+                returncode = proc.wait()
+            finally:
+                timer.cancel()
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+            
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace")
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        return returncode, stderr
+    
     def render_existing_file(self, scene_file: Path, **kwargs) -> Dict[str, Any]:
         """Render an existing POV-Ray scene file."""
         
@@ -1315,11 +2942,11 @@ class RayLM:
             
             # Render the scene
             render_start = time.time()
-            ini_file = self.renderer.create_ini_file(
+            render_options = self.renderer.build_render_options(
                 scene_file, output_file, width, height, quality
             )
             
-            success = self.renderer.render_scene(scene_file, output_file, ini_file, timeout, metrics)
+            success = self.renderer.render_scene(scene_file, output_file, render_options, timeout, metrics)
             
             if success:
                 metrics.complete()
@@ -1348,881 +2975,477 @@ class RayLM:
             raise
 
 # Main function and command-line interface
-def main():
-    """Enhanced main function with comprehensive argument parsing."""
-    
-    parser = argparse.ArgumentParser(
-        description="""RayLM v3.6: Enhanced AI-Powered POV-Ray Scene Generator
-        
-Generate 3D scenes for POV-Ray using Large Language Models with advanced
-error handling, performance monitoring, and improved reliability.""",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-EXAMPLES:
-  # Generate a scene from prompt
-  python raylm3.6.py "A futuristic city at sunset with flying cars"
-  
-  # Generate with custom resolution
-  python raylm3.6.py "A medieval castle" --width 2560 --height 1440 --quality 10
-  
-  # Generate animation
-  python raylm3.6.py "A rotating crystal sculpture" --animate --duration 10 --fps 30
-  
-  # Render existing POV-Ray code using the OpenAI client with retry logic and improved error handling
-                
-        raise RayLMConfigurationError(f"Failed to initialize OpenAI client: {e}")
-    
-    def generate_scene_code(self, prompt: str, metrics: PerformanceMetrics) -> str:
-        """Generate POV-Ray scene code with retry logic."""
-        
-        # Enhanced system prompt for better code generation
-        system_prompt = """You are a professional POV-Ray scene generator with expertise in 3D graphics and rendering.
+def _config_from_args(args: argparse.Namespace) -> RayLMConfig:
+    """Build the application configuration from parsed command-line arguments."""
+    # Options not given on the command line keep the RayLMConfig defaults
+    overrides = {name: value for name, value in (
+        ('generator_model', args.generator_model or None),
+        ('verifier_model', args.verifier_model or None),
+        ('default_timeout', args.timeout or None),
+        ('render_workers', args.render_workers or None),
+        ('frame_memory_mb', args.frame_memory_mb),
+    ) if value is not None}
+    if args.no_verification:
+        overrides['verifier_model'] = None
+    
+    return RayLMConfig(
+        output_dir=args.output_dir,
+        generator_temperature=args.temperature,
+        enable_cache=not args.no_cache,
+        batch_single_request=args.batch_single_request,
+        structured_output=not args.no_structured_output,
+        template_mode=args.template,
+        stream_responses=not args.no_stream,
+        prompt_caching=not args.no_prompt_cache,
+        hw_encode=args.hw_encode,
+        cache_generations=args.cache_scenes,
+        stream_frames=args.stream_frames,
+        cluster_backend=args.cluster_backend,
+        cluster_address=args.cluster_address,
+        **overrides
+    )
 
-IMPORTANT REQUIREMENTS:
-1. Generate ONLY valid POV-Ray SDL code - no explanations, markdown, or additional text
-2. Include these essential includes: colors.inc, textures.inc, finish.inc, metals.inc, stones.inc, woods.inc
-3. Always include: camera, lights, and at least one 3D object
-4. Use proper POV-Ray syntax and conventions
-5. Add helpful comments for complex parts
-6. Ensure complete and syntactically correct code
-7. Use appropriate materials, textures, and lighting
+# Limits on numeric options, shared by the CLI arguments and --prompts-file lines
+_OPTION_LIMITS = MappingProxyType({
+    'width': (1, 8192),
+    'height': (1, 8192),
+    'quality': (1, 10),
+    'timeout': (1, None),
+    'fps': (1, 240),
+    'duration': (1, 3600),
+    'frames': (1, 100_000),
+    'antialiasing_threshold': (0.0, 1.0),
+    'antialiasing_depth': (1, 9),
+})
+_FLAG_OPTIONS = frozenset({'no_render', 'preview', 'animate'})
 
-Example structure:
-```
-#include "colors.inc"
-#include "textures.inc"
-#include "finish.inc"
-#include "metals.inc"
-#include "stones.inc"
-#include "woods.inc"
+def _option_errors(options: Dict[str, Any], cli: bool = False) -> List[str]:
+    """Type and range problems in generate_scene options; None values are skipped.
+    
+    cli names the options as command-line flags (--fps) instead of keys (fps).
+    """
+    errors = []
+    for name, value in options.items():
+        if value is None:
+            continue
+        label = f"--{name.replace('_', '-')}" if cli else name
+        if name in _FLAG_OPTIONS:
+            if not isinstance(value, bool):
+                errors.append(f"{label} must be true or false (got {value!r})")
+        elif name == 'resolution':
+            if not isinstance(value, str):
+                errors.append(f"{label} must be a string (got {value!r})")
+            elif value not in _RESOLUTION_PRESETS:
+                errors.append(f"{label} must be one of {', '.join(_RESOLUTION_PRESETS)} (got {value!r})")
+        elif name in _OPTION_LIMITS:
+            low, high = _OPTION_LIMITS[name]
+            kinds = (int, float) if isinstance(low, float) else int
+            if isinstance(value, bool) or not isinstance(value, kinds):
+                kind = "a number" if isinstance(low, float) else "an integer"
+                errors.append(f"{label} must be {kind} (got {value!r})")
+            elif high is None and value < low:
+                errors.append(f"{label} must be at least {low} (got {value})")
+            elif high is not None and not low <= value <= high:
+                errors.append(f"{label} must be between {low} and {high} (got {value})")
+    
+    width, height = options.get('width'), options.get('height')
+    if isinstance(width, int) and isinstance(height, int) and not errors:
+        # Both sides in range can still exceed the total pixel budget
+        errors.extend(ValidationSystem.validate_resolution(width, height)[1])
+    return errors
 
-camera {
-    location <0, 2, -5>
-    look_at <0, 1, 0>
-}
+def _validate_args(args: argparse.Namespace) -> None:
+    """Reject out-of-range numeric options before any API call or render is started."""
+    errors = _option_errors({name: getattr(args, name) for name in _OPTION_LIMITS}, cli=True)
+    if errors:
+        raise RayLMValidationError(f"Invalid arguments: {errors}")
 
-light_source {
-    <10, 10, -10>
-    color White
-}
+# generate_scene options a --prompts-file line may set for its own prompt
+_PROMPT_OPTIONS = frozenset({'width', 'height', 'resolution', 'quality', 'timeout', 'no_render',
+                             'preview', 'animate', 'duration', 'fps', 'frames'})
 
-object {
-    sphere {
-        <0, 1, 0>, 1
-        texture {
-            pigment { color Red }
-            finish { specular 0.4 }
-        }
-    }
-}
-```
-"""
-        
-        user_prompt = f"""Generate a POV-Ray scene for: {prompt}
-
-Ensure the scene is complete, visually interesting, and uses proper POV-Ray SDL syntax. Include all necessary components (camera, lights, objects, materials)."""
-        
-        def _make_api_call():
-            return self._client.chat.completions.create(
-                model=self.config.generator_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=4000,
-                timeout=self.config.api_timeout
-            )
-        
-        try:
-            print(f"🎨 Generating scene code with model: {self.config.generator_model}")
-            logger.info(f"Generating scene code with model: {self.config.generator_model}")
-            
-            # Show progress during generation
-            print("⏳ Contacting AI model...", end="", flush=True)
-            
-            response = self._retry_api_call(_make_api_call)
-            
-            print(" ✅")
-            print("📝 Processing AI response...", end="", flush=True)
-            
-            scene_code = response.choices[0].message.content.strip()
-            
-            # Basic validation
-            is_valid, errors = ValidationSystem.validate_scene_code(scene_code)
-            if not is_valid:
-                logger.warning(f"Generated code validation failed: {errors}")
-                # Try to fix common issues
-                scene_code = fix_common_issues(scene_code)
-            
-            logger.debug(f"Generated scene code (length: {len(scene_code)} chars)")
-            print(f" ✅ ({len(scene_code)} chars)")
-            
-            metrics.metadata['model_used'] = self.config.generator_model
-            metrics.metadata['prompt_length'] = len(prompt)
-            metrics.metadata['response_length'] = len(scene_code)
-            
-            logger.info(f"Scene code generated successfully ({len(scene_code)} characters)")
-            return scene_code
-            
-        except Exception as e:
-            metrics.complete(str(e))
-            logger.error(f"Failed to generate scene code: {e}")
-            raise RayLMAPIError(f"Scene code generation failed: {e}")
-    
-    def verify_scene_code(self, scene_code: str, prompt: str, metrics: PerformanceMetrics) -> str:
-        """Verify and correct POV-Ray scene code."""
-        
-        system_prompt = """You are an expert POV-Ray code reviewer and validator.
-
-Your task is to:
-1. Verify the syntax and completeness of POV-Ray code
-2. Fix any syntax errors, missing includes, or structural issues
-3. Ensure the code follows POV-Ray best practices
-4. Return ONLY the corrected POV-Ray code
-5. Do NOT add explanations, comments, or markdown
-
-CRITICAL REQUIREMENTS:
-- Must include: colors.inc, textures.inc, finish.inc
-- Must have camera, light_source, and at least one object
-- All braces must be balanced
-- All statements must be properly terminated
-- Use proper POV-Ray SDL syntax
-
-Return ONLY the corrected code, nothing else."""
-        
-        user_prompt = f"""Please review and correct this POV-Ray code:
-
-Original Prompt: {prompt}
-
-POV-Ray Code:
-{scene_code}
-
-Return only the corrected POV-Ray code."""
-        
-        def _make_api_call():
-            return self._client.chat.completions.create(
-                model=self.config.verifier_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.2,
-                max_tokens=3000,
-                timeout=self.config.api_timeout
-            )
-        
-        try:
-            print(f"🔍 Verifying scene code with model: {self.config.verifier_model}")
-            logger.info(f"Verifying scene code with model: {self.config.verifier_model}")
-            
-            print("⏳ Contacting verification model...", end="", flush=True)
-            
-            response = self._retry_api_call(_make_api_call)
-            
-            print(" ✅")
-            print("🔧 Processing verification...", end="", flush=True)
-            
-            corrected_code = response.choices[0].message.content.strip()
-            
-            # Validate the corrected code
-            is_valid, errors = ValidationSystem.validate_scene_code(corrected_code)
-            if not is_valid:
-                logger.error(f"Corrected code still has issues: {errors}")
-                raise ValueError(f"Verification failed: {errors}")
-            
-            logger.debug(f"Corrected scene code (length: {len(corrected_code)} chars)")
-            print(f" ✅ ({len(corrected_code)} chars)")
-            
-            metrics.metadata['verification_model'] = self.config.verifier_model
-            logger.info(f"Scene code verified and corrected ({len(corrected_code)} characters)")
-            return corrected_code
-            
-        except Exception as e:
-            metrics.complete(str(e))
-            logger.error(f"Failed to verify scene code: {e}")
-            raise RayLMAPIError(f"Scene code verification failed: {e}")
-    
-    def _retry_api_call(self, api_call_func):
-        """Retry API calls with exponential backoff."""
-        last_exception = None
-        
-        for attempt in range(self.config.max_retries):
-            try:
-                return api_call_func()
-                
-            except (RateLimitError, APIError) as e:
-                last_exception = e
-                if attempt == self.config.max_retries - 1:
-                    break
-                
-                delay = self.config.retry_delay * (2 ** attempt)
-                logger.warning(f"API call attempt {attempt + 1} failed: {e}. Retrying in {delay}s...")
-                time.sleep(delay)
-                
-            except (Timeout, Exception) as e:
-                last_exception = e
-                if attempt == self.config.max_retries - 1:
-                    break
-                
-                delay = self.config.retry_delay * (2 ** attempt)
-                logger.warning(f"API call attempt {attempt + 1} timed out: {e}. Retrying in {delay}s...")
-                time.sleep(delay)
-        
-        raise last_exception or RayLMAPIError("API call failed after all retries")
-
-def fix_common_issues(scene_code: str) -> str:
-    """Fix common issues in generated POV-Ray code."""
-    # Add missing includes if they're completely missing
-    includes = ['colors.inc', 'textures.inc', 'finish.inc']
-    for include in includes:
-        if f'#include "{include}"' not in scene_code:
-            scene_code = f'#include "{include}"\n' + scene_code
-    
-    # Fix unbalanced braces by adding closing braces
-    open_braces = scene_code.count('{')
-    close_braces = scene_code.count('}')
-    if open_braces > close_braces:
-        scene_code += '}' * (open_braces - close_braces)
-    
-    return scene_code
-
-# Enhanced POV-Ray renderer
-class POVRayRenderer:
-    """Enhanced POV-Ray renderer with comprehensive error handling."""
-    
-    def __init__(self, config: RayLMConfig):
-        self.config = config
-        self._validate_povray_installation()
-    
-    def _validate_povray_installation(self) -> None:
-        """Validate that POV-Ray is properly installed."""
-        try:
-            result = subprocess.run(
-                ['povray', '--version'], 
-                capture_output=True, 
-                text=True, 
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                version_info = result.stdout.strip()
-                logger.info(f"POV-Ray found: {version_info}")
-            else:
-                raise RayLMConfigurationError("POV-Ray installation verification failed")
-                
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            raise RayLMConfigurationError("POV-Ray not found. Please install POV-Ray 3.7 or later.")
-    
-    def create_ini_file(self, scene_file: Path, output_file: Path, 
-                       width: int, height: int, quality: int = 9,
-                       antialiasing: str = "on", antialiasing_threshold: float = 0.3,
-                       antialiasing_depth: int = 2, clock_value: Optional[float] = None) -> Path:
-        """Create POV-Ray INI configuration file."""
-        
-        # Basic validation
-        if width <= 0 or height <= 0:
-            raise ValueError(f"Invalid dimensions: {width}x{height}")
-        
-        if not scene_file.exists():
-            raise FileNotFoundError(f"Scene file does not exist: {scene_file}")
-        
-        # Ensure output directory exists
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        ini_content = f"""Input_File_Name="{scene_file.resolve()}"
-Output_File_Name="{output_file.resolve()}"
-Width={width}
-Height={height}
-Antialias={antialiasing}
-Antialias_Threshold={antialiasing_threshold}
-Antialias_Depth={antialiasing_depth}
-Quality={quality}
-Output_Alpha=Off
-Display=Off
-+W{width}+H{height}
-+Q{quality}
-+A{antialiasing_threshold}/{antialiasing_depth}
-"""
-        
-        # Add clock parameter for animations if provided
-        if clock_value is not None:
-            ini_content += f"Clock={clock_value}\n"
-        
-        ini_file = scene_file.with_suffix(".ini")
-        
-        try:
-            with open(ini_file, "w") as f:
-                f.write(ini_content)
-            logger.debug(f"INI file created: {ini_file}")
-            return ini_file
-        except Exception as e:
-            logger.error(f"Failed to create INI file: {e}")
-            raise RayLMRenderingError(f"INI file creation failed: {e}")
-    
-    def render_scene(self, scene_file: Path, output_file: Path, ini_file: Path, 
-                    timeout: Optional[int] = None, metrics: Optional[PerformanceMetrics] = None) -> bool:
-        """Render POV-Ray scene with comprehensive error handling."""
-        
-        if timeout is None:
-            timeout = self.config.default_timeout
-        
-        cmd = [
-            "povray", 
-            str(ini_file),
-            "+P",  # Progress reporting
-            "+V"   # Verbose output
-        ]
-        
-        start_time = time.time()
-        
-        try:
-            logger.info(f"Rendering scene: {scene_file.name} -> {output_file.name}")
-            
-            print(f"🖼️  Starting POV-Ray render ({width}x{height}, Q{quality})...")
-            print(f"   This may take a while. Progress will be shown below:")
-            
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=timeout,
-                cwd=scene_file.parent
-            )
-            
-            render_time = time.time() - start_time
-            
-            if result.returncode == 0:
-                print(f"✅ Render completed successfully!")
-                logger.info(f"Rendering completed successfully in {render_time:.2f}s: {output_file}")
-                
-                # Verify output file was created
-                if output_file.exists():
-                    file_size = output_file.stat().st_size
-                    print(f"📁 Output file: {output_file.name} ({file_size / 1024:.1f} KB)")
-                    logger.info(f"Output file size: {file_size / 1024:.2f} KB")
-                    
-                    if metrics:
-                        metrics.metadata['render_time'] = render_time
-                        metrics.metadata['output_size'] = file_size
-                        metrics.metadata['command'] = ' '.join(cmd)
-                    
-                    return True
-                else:
-                    print(f"⚠️  POV-Ray reported success but output file not found")
-                    logger.warning(f"POV-Ray reported success but output file not found: {output_file}")
-                    return False
-                    
-            else:
-                print(f"❌ Render failed (error code {result.returncode})")
-                logger.error(f"Rendering failed with error code {result.returncode}")
-                logger.error(f"Command: {' '.join(cmd)}")
-                logger.error(f"Error output: {result.stderr}")
-                
-                if result.stdout:
-                    logger.debug(f"Standard output: {result.stdout}")
-                
-                if metrics:
-                    metrics.complete(f"POV-Ray error code {result.returncode}: {result.stderr}")
-                
-                return False
-                
-        except subprocess.TimeoutExpired:
-            error_msg = f"Rendering timed out after {timeout} seconds"
-            print(f"❌ {error_msg}")
-            logger.error(error_msg)
-            
-            if metrics:
-                metrics.complete(error_msg)
-            
-            raise RayLMTimeoutError(error_msg)
-            
-        except Exception as e:
-            logger.error(f"Rendering failed with exception: {e}")
-            
-            if metrics:
-                metrics.complete(str(e))
-            
-            raise RayLMRenderingError(f"Rendering failed: {e}")
-
-# Enhanced main application class
-class RayLM:
-    """Enhanced RayLM application with comprehensive error handling and monitoring."""
-    
-    def __init__(self, config: Optional[RayLMConfig] = None):
-        self.config = config or RayLMConfig()
-        self._validate_configuration()
-        
-        # Initialize components
-        self.file_manager = FileManager(self.config)
-        self.llm_client = LLMClient(self.config)
-        self.renderer = POVRayRenderer(self.config)
-        
-        logger.info("RayLM v3.6 initialized successfully")
-    
-    def _validate_configuration(self) -> None:
-        """Validate the application configuration."""
-        issues = self.config.validate()
-        if issues:
-            for issue in issues:
-                if "ZAGUAN_API_KEY" in issue:
-                    logger.error(issue)
-            raise RayLMConfigurationError(f"Configuration issues: {issues}")
-    
-    def _parse_resolution_preset(self, resolution: str) -> Tuple[int, int]:
-        """Parse resolution preset to width and height."""
-        resolutions = {
-            "480p": (854, 480),
-            "720p": (1280, 720),
-            "1080p": (1920, 1080),
-            "1440p": (2560, 1440),
-            "4k": (3840, 2160)
-        }
-        
-        if resolution in resolutions:
-            return resolutions[resolution]
-        else:
-            raise RayLMValidationError(f"Unknown resolution preset: {resolution}")
-    
-    def _validate_dimensions(self, width: int, height: int) -> None:
-        """Validate resolution dimensions."""
-        if width is None or height is None:
-            raise RayLMValidationError("Resolution dimensions cannot be None")
-        
-        is_valid, errors = ValidationSystem.validate_resolution(width, height)
-        if not is_valid:
-            raise RayLMValidationError(f"Invalid resolution: {errors}")
-    
-    def _generate_animation_frames(self, scene_code: str, prompt: str, metrics: PerformanceMetrics,
-                                  scene_file: Path, output_file: Path,
-                                  width: int, height: int, quality: int,
-                                  timeout: int, fps: int, total_frames: int) -> List[Path]:
-        """Generate animation frames by varying the clock parameter."""
-        logger.info(f"Generating animation with {total_frames} frames")
-        
-        if total_frames <= 0:
-            raise ValueError("Number of frames must be positive")
-        
-        frame_files = []
-        temp_files = []  # Track temporary files for cleanup
-        
-        try:
-            for i in range(total_frames):
-                clock_value = i / max(1, (total_frames - 1))
-                print(f"   🎬 Frame {i+1:3d}/{total_frames} (clock={clock_value:.3f})...", end="", flush=True)
-                
-                # Create frame-specific filenames
-                frame_suffix = f"_frame_{i:03d}"
-                temp_scene_file = self.file_manager.create_scene_filename(
-                    prompt, timestamp=datetime.now().strftime("%Y%m%d_%H%M%S")
-                ).with_name(f"{scene_file.stem}{frame_suffix}.pov")
-                temp_ini_file = temp_scene_file.with_suffix(".ini")
-                frame_output_file = self.file_manager.create_output_filename(
-                    prompt, timestamp=datetime.now().strftime("%Y%m%d_%H%M%S")
-                ).with_name(f"{output_file.stem}{frame_suffix}.png")
-                
-                temp_files.extend([temp_scene_file, temp_ini_file])
-                
-                # Inject clock value into scene code
-                animated_scene_code = self._inject_clock_value(scene_code, clock_value)
-                
-                # Validate the animated scene code
-                is_valid, errors = ValidationSystem.validate_scene_code(animated_scene_code)
-                if not is_valid:
-                    print(f" ⚠️  (validation failed)")
-                    logger.warning(f"Frame {i+1} code validation failed: {errors}")
-                    continue
-                
-                try:
-                    # Write scene file
-                    with open(temp_scene_file, "w") as f:
-                        f.write(animated_scene_code)
-                    
-                    # Create INI file with clock parameter
-                    self._validate_dimensions(width, height)
-                    ini_file = self.renderer.create_ini_file(
-                        temp_scene_file, frame_output_file, 
-                        width, height, quality,
-                        clock_value=clock_value
-                    )
-                    
-                    # Render the frame
-                    render_start = time.time()
-                    if self.renderer.render_scene(temp_scene_file, frame_output_file, ini_file, timeout):
-                        frame_time = time.time() - render_start
-                        print(f" ✅ ({frame_time:.1f}s)")
-                        frame_files.append(frame_output_file)
-                    else:
-                        print(f" ❌")
-                        logger.warning(f"Failed to render frame {i+1}")
-                        
-                except Exception as e:
-                    print(f" ❌ ({e})")
-                    logger.error(f"Error rendering frame {i+1}: {e}")
-                    
-            logger.info(f"Animation generation completed. Successfully rendered {len(frame_files)}/{total_frames} frames.")
-            return frame_files
-            
-        except Exception as e:
-            logger.error(f"Animation generation failed: {e}")
-            raise
-        finally:
-            # Clean up temporary files
-            for temp_file in temp_files:
-                try:
-                    if temp_file.exists():
-                        temp_file.unlink()
-                        logger.debug(f"Cleaned up temporary file: {temp_file}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up {temp_file}: {e}")
-    
-    def _inject_clock_value(self, scene_code: str, clock_value: float) -> str:
-        """Inject clock value into POV-Ray scene code."""
-        # Look for existing clock declaration and replace it
-        clock_pattern = r'#declare\s+Clock\s*=\s*[^;]+;'
-        if re.search(clock_pattern, scene_code, re.IGNORECASE):
-            # Replace existing clock declaration
-            scene_code = re.sub(clock_pattern, f'#declare Clock = {clock_value};', scene_code, flags=re.IGNORECASE)
-        else:
-            # Add clock declaration after includes
-            include_end = scene_code.find('\n\n')
-            if include_end == -1:
-                include_end = scene_code.find('\n')
-            if include_end != -1:
-                scene_code = scene_code[:include_end] + f'\n#declare Clock = {clock_value};' + scene_code[include_end:]
-            else:
-                # Fallback: prepend clock declaration
-                scene_code = f'#declare Clock = {clock_value};\n' + scene_code
-        
-        return scene_code
-    
-    def generate_scene(self, prompt: str, **kwargs) -> Dict[str, Any]:
-        """Generate a POV-Ray scene with comprehensive error handling."""
-        metrics = PerformanceMetrics("scene_generation")
-        
-        try:
-            # Validate prompt
-            is_valid, errors = ValidationSystem.validate_prompt(prompt)
-            if not is_valid:
-                raise RayLMValidationError(f"Invalid prompt: {}")
-            
-            logger.info(f"Starting scene generation for prompt: {prompt[:50]}{'...' if len(prompt) > 50 else ''}")
-            
-            # Extract parameters with defaults
-            width = kwargs.get('width', self.config.default_width)
-            height = kwargs.get('height', self.config.default_height)
-            
-            # Handle resolution presets if width/height are None
-            resolution = kwargs.get('resolution')
-            if resolution and (width is None or height is None):
-                width, height = self._parse_resolution_preset(resolution)
-            
-            # Ensure we have valid dimensions
-            if width is None or height is None:
-                width, height = self.config.default_width, self.config.default_height
-            
-            quality = kwargs.get('quality', self.config.default_quality)
-            timeout = kwargs.get('timeout', self.config.default_timeout)
-            no_render = kwargs.get('no_render', False)
-            preview = kwargs.get('preview', False)
-            animate = kwargs.get('animate', False)
-            duration = kwargs.get('duration', self.config.default_duration)
-            fps = kwargs.get('fps', self.config.default_fps)
-            frames = kwargs.get('frames')
-            
-            # Configure preview mode
-            if preview:
-                width, height = 320, 240
-                quality = 4
-            
-            # Generate scene code
-            scene_code = self.llm_client.generate_scene_code(prompt, metrics)
-            
-            # Validate generated code
-            if self.config.validate_syntax:
-                is_valid, errors = ValidationSystem.validate_scene_code(scene_code)
-                if not is_valid:
-                    logger.warning(f"Generated code validation issues: {errors}")
-            
-            # Create filenames
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            scene_file = self.file_manager.create_scene_filename(prompt, timestamp)
-            output_file = self.file_manager.create_output_filename(prompt, timestamp)
-            
-            # Save scene code
-            with open(scene_file, 'w') as f:
-                f.write(scene_code)
-            
-            # Verify scene code
-            if self.config.verifier_model:
-                try:
-                    verification_start = time.time()
-                    scene_code = self.llm_client.verify_scene_code(scene_code, prompt, metrics)
-                    verification_time = time.time() - verification_start
-                    
-                    # Save verified code
-                    with open(scene_file, 'w') as f:
-                        f.write(scene_code)
-                    
-                    metrics.metadata['verification_time'] = verification_time
-                    logger.info(f"Scene code verified and updated ({verification_time:.2f}s)")
-                    
-                except Exception as e:
-                    logger.warning(f"Scene verification failed: {e}")
-                    metrics.metadata['verification_error'] = str(e)
-            
-            if no_render:
-                metrics.complete()
-                return {
-                    'success': True,
-                    'scene_file': scene_file,
-                    'scene_code': scene_code,
-                    'metrics': metrics
-                }
-            
-            # Animation branch
-            if animate:
-                frames = frames or (duration * fps)
-                frame_files = self._generate_animation_frames(
-                    scene_code, prompt, metrics, scene_file, output_file, 
-                    width, height, quality, timeout, fps, frames
-                )
-                
-                if not frame_files:
-                    return {
-                        'success': False,
-                        'error': "No frames generated",
-                        'metrics': metrics
-                    }
-                
-                # Render animation
-                animation_output = self.file_manager.create_output_filename(
-                    prompt, timestamp, extension="mp4"
-                )
-                
-                animation_success = self.render_animation(
-                    frame_files, animation_output, fps, metrics
-                )
-                
-                if animation_success:
-                    self.file_manager.save_metadata(metrics, animation_output)
-                    
-                    return {
-                        'success': True,
-                        'scene_file': scene_file,
-                        'output_file': animation_output,
-                        'scene_code': scene_code,
-                        'metrics': metrics
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'scene_file': scene_file,
-                        'error': "Animation rendering failed",
-                        'metrics': metrics
-                    }
-            
-            # Render scene branch
-            render_metrics = PerformanceMetrics("scene_rendering")
-            
-            ini_file = self.renderer.create_ini_file(
-                scene_file, output_file, width, height, quality
-            )
-            
-            success = self.renderer.render_scene(scene_file, output_file, ini_file, timeout, render_metrics)
-            
-            if success:
-                metrics.complete()
-                
-                # Save metadata
-                self.file_manager.save_metadata(metrics, output_file)
-                
-                return {
-                    'success': True,
-                    'scene_file': scene_file,
-                    'output_file': output_file,
-                    'scene_code': scene_code,
-                    'metrics': metrics
-                }
-            else:
-                metrics.complete("Rendering failed")
-                return {
-                    'success': False,
-                    'scene_file': scene_file,
-                    'error': "Rendering failed",
-                    'metrics': metrics
-                }
-            
-        except Exception as e:
-            logger.error(f"Scene generation failed: {e}")
-            metrics.complete(str(e))
-            raise
-    
-    def render_animation(self, frame_files: List[Path], output_path: Path, fps: int,
-                        metrics: Optional[PerformanceMetrics] = None) -> bool:
-        """Render animation from frames using FFmpeg."""
+def _read_prompts_file(path: Path) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Read a JSONL prompts file into prompts and their per-prompt options.
+    
+    Each non-empty line is either a JSON string or an object with a
+    "prompt" key plus any of _PROMPT_OPTIONS, whose values are checked
+    against the same limits as the command-line options.
+    """
+    prompts, overrides = [], []
+    try:
+        with open(path, "rb") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError as e:
+                    raise RayLMValidationError(f"{path}:{line_no}: invalid JSON: {e}")
+                if isinstance(entry, str):
+                    entry = {'prompt': entry}
+                if not isinstance(entry, dict) or not isinstance(entry.get('prompt'), str):
+                    raise RayLMValidationError(f"{path}:{line_no}: expected a string or an object with a \"prompt\"")
+                unknown = entry.keys() - _PROMPT_OPTIONS - {'prompt'}
+                if unknown:
+                    raise RayLMValidationError(f"{path}:{line_no}: unknown options: {', '.join(sorted(unknown))}")
+                errors = _option_errors({k: v for k, v in entry.items() if k != 'prompt'})
+                if errors:
+                    raise RayLMValidationError(f"{path}:{line_no}: {'; '.join(errors)}")
+                prompts.append(entry.pop('prompt'))
+                overrides.append(entry)
+    except OSError as e:
+        raise RayLMValidationError(f"Cannot read prompts file: {e}")
+    return prompts, overrides
+
+def _print_batch_summary(results: List[Dict[str, Any]]) -> int:
+    """Print one line per batch result; returns the exit status (1 if any failed)."""
+    failed = sum(1 for res in results if not res['success'])
+    print(f"\n📦 Batch summary: {len(results) - failed}/{len(results)} succeeded")
+    for i, res in enumerate(results, 1):
+        if res['success']:
+            print(f"  {i:3d}. ✅ {res.get('output_file') or res['scene_file']}")
+        else:
+            print(f"  {i:3d}. ❌ {res.get('error', 'Unknown error')}")
+    return 1 if failed else 0
+
+def _run_command(raylm: RayLM, args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """Run the operation selected by the command-line arguments; returns the exit status.
+    
+    With --quiet everything printed to stdout is discarded; log messages
+    still go to stderr and the exit status reports the outcome.
+    """
+    if not args.quiet:
+        return _dispatch_command(raylm, args, parser)
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        return _dispatch_command(raylm, args, parser)
+
+def _dispatch_command(raylm: RayLM, args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """Dispatch on the command-line arguments and print the outcome; returns the exit status."""
+    if args.collect_batch:
+        results = raylm.wait_batch(
+            args.collect_batch,
+            width=args.width,
+            height=args.height,
+            quality=args.quality,
+            timeout=args.timeout,
+            no_render=args.no_render
+        )
+        return _print_batch_summary(results)
+    elif args.render:
+        # Render existing file
+        result = raylm.render_existing_file(
+            args.render,
+            width=args.width,
+            height=args.height,
+            quality=args.quality,
+            timeout=args.timeout
+        )
+    elif args.prompts_file:
+        # One process, one RayLM instance and one connection pool for every prompt
+        prompts, overrides = _read_prompts_file(args.prompts_file)
+        if not prompts:
+            logger.error("Prompts file is empty")
+            return 1
+        
+        width, height = args.width, args.height
+        if args.resolution and (width is None or height is None):
+            width, height = _RESOLUTION_PRESETS[args.resolution]  # --resolution choices are the preset names
+        
+        results = raylm.batch_render(
+            prompts,
+            overrides=overrides,
+            width=width,
+            height=height,
+            quality=args.quality,
+            timeout=args.timeout,
+            no_render=args.no_render,
+            preview=args.preview,
+            animate=args.animate,
+            duration=args.duration,
+            fps=args.fps,
+            frames=args.frames,
+            resolution=args.resolution
+        )
         
-        if not frame_files:
-            logger.error("No frame files to render")
-            return False
+        return _print_batch_summary(results)
+    elif args.prompt_file:
+        # Read prompt from file
+        if not args.prompt_file.exists():
+            logger.error(f"Prompt file does not exist: {args.prompt_file}")
+            return 1
         
-        # Check FFmpeg availability
+        # utf-8-sig drops a BOM left by Windows editors; strip after decoding so
+        # Unicode whitespace goes too
         try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, timeout=10, check=True)
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            logger.error("FFmpeg not found. Cannot create animation.")
-            return False
-        
-        # Validate frame files exist
-        missing_files = [f for f in frame_files if not f.exists()]
-        if missing_files:
-            logger.error(f"Missing frame files: {missing_files}")
-            return False
+            prompt = args.prompt_file.read_bytes().decode('utf-8-sig').strip()
+        except UnicodeDecodeError as e:
+            raise RayLMValidationError(f"{args.prompt_file}: prompt file is not valid UTF-8: {e}")
         
-        # Ensure output directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not prompt:
+            logger.error("Prompt file is empty")
+            return 1
         
-        # Create frame list file for FFmpeg
-        temp_list_file = output_path.with_suffix(".txt")
+        # Handle resolution presets
+        resolution = args.resolution
+        width, height = args.width, args.height
         
-        try:
-            with open(temp_list_file, "w") as f:
-                for frame_file in sorted(frame_files):
-                    f.write(f"file '{frame_file.name}'\n")
-                    f.write(f"duration {1/fps}\n")
-                # Add the last frame again to close the sequence
-                f.write(f"file '{frame_files[-1].name}'\n")
-            
-            # Enhanced FFmpeg command with better quality settings
-            cmd = [
-                "ffmpeg",
-                "-y",  # Overwrite output file
-                "-f", "concat",
-                "-safe", "0",
-                "-i", str(temp_list_file),
-                "-c:v", "libx264",
-                "-preset", "medium",  # Balance between speed and quality
-                "-crf", "23",  # Quality level (lower = better quality)
-                "-pix_fmt", "yuv420p",  # Compatibility
-                "-vf", f"fps={fps}",
-                "-movflags", "+faststart",  # For better web compatibility
-                str(output_path)
-            ]
-            
-            start_time = time.time()
-            
-            try:
-                result = subprocess.run(
-                    cmd, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=600,  # 10 minutes timeout
-                    cwd=output_path.parent
-                )
-                
-                render_time = time.time() - start_time
-                
-                # Clean up frame list file
-                temp_list_file.unlink(missing_ok=True)
-                
-                if result.returncode == 0:
-                    logger.info(f"Animation rendered successfully in {render_time:.2f}s: {output_path}")
-                    
-                    if output_path.exists():
-                        file_size = output_path.stat().st_size
-                        logger.info(f"Animation file size: {file_size / (1024*1024):.2f} MB")
-                        
-                        if metrics:
-                            metrics.metadata['render_time'] = render_time
-                            metrics.metadata['output_size'] = file_size
-                            metrics.metadata['frame_count'] = len(frame_files)
-                            metrics.metadata['fps'] = fps
-                    
-                    return True
-                    
-                else:
-                    logger.error(f"Animation rendering failed with error code {result.returncode}")
-                    logger.error(f"Command: {' '.join(cmd)}")
-                    logger.error(f"Error output: {result.stderr}")
-                    
-                    if metrics:
-                        metrics.complete(f"FFmpeg error code {result.returncode}: {result.stderr}")
-                    
-                    return False
-                    
-            except subprocess.TimeoutExpired:
-                error_msg = "Animation rendering timed out after 600 seconds"
-                logger.error(error_msg)
-                temp_list_file.unlink(missing_ok=True)
-                
-                if metrics:
-                    metrics.complete(error_msg)
-                
-                return False
-                
-        except Exception as e:
-            logger.error(f"Failed to create frame list or run FFmpeg: {e}")
-            temp_list_file.unlink(missing_ok=True)
-            return False
-    
-    def render_existing_file(self, scene_file: Path, **kwargs) -> Dict[str, Any]:
-        """Render an existing POV-Ray scene file."""
+        if resolution and (width is None or height is None):
+            width, height = _RESOLUTION_PRESETS[resolution]  # --resolution choices are the preset names
         
-        metrics = PerformanceMetrics("file_rendering")
+        # Ensure valid dimensions
+        if width is None or height is None:
+            width, height = raylm.config.default_width, raylm.config.default_height
         
-        try:
-            if not scene_file.exists():
-                raise RayLMValidationError(f"Scene file does not exist: {scene_file}")
-            
-            width = kwargs.get('width', self.config.default_width)
-            height = kwargs.get('height', self.config.default_height)
-            quality = kwargs.get('quality', self.config.default_quality)
-            timeout = kwargs.get('timeout', self.config.default_timeout)
+        if args.batch:
+            prompts = [line.strip() for line in prompt.splitlines() if line.strip()]
+            if args.submit_batch:
+                raylm.submit_batch(prompts)
+                return 0
             
-            logger.info(f"Rendering existing file: {scene_file}")
-            
-            # Create output filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = self.file_manager.create_output_filename(
-                scene_file.stem, timestamp
-            )
-            
-            # Render the scene
-            ini_file = self.renderer.create_ini_file(
-                scene_file, output_file, width, height, quality
+            results = raylm.batch_render(
+                prompts,
+                width=width,
+                height=height,
+                quality=args.quality,
+                timeout=args.timeout,
+                no_render=args.no_render,
+                preview=args.preview,
+                animate=args.animate,
+                duration=args.duration,
+                fps=args.fps,
+                frames=args.frames,
+                resolution=resolution
             )
             
-            success = self.renderer.render_scene(scene_file, output_file, ini_file, timeout, metrics)
-            
-            if success:
-                metrics.complete()
-                
-                # Save metadata
-                self.file_manager.save_metadata(metrics, output_file)
-                
-                return {
-                    'success': True,
-                    'scene_file': scene_file,
-                    'output_file': output_file,
-                    'metrics': metrics
-                }
-            else:
-                metrics.complete("Rendering failed")
-                return {
-                    'success': False,
-                    'scene_file': scene_file,
-                    'error': "Rendering failed",
-                    'metrics': metrics
-                }
-            
-        except Exception as e:
-            logger.error(f"File rendering failed: {e}")
-            metrics.complete(str(e))
-            raise
+            return _print_batch_summary(results)
+        
+        result = raylm.generate_scene(
+            prompt,
+            width=width,
+            height=height,
+            quality=args.quality,
+            timeout=args.timeout,
+            no_render=args.no_render,
+            preview=args.preview,
+            animate=args.animate,
+            duration=args.duration,
+            fps=args.fps,
+            frames=args.frames,
+            resolution=resolution
+        )
+    elif args.prompt:
+        # Handle resolution presets
+        resolution = args.resolution
+        width, height = args.width, args.height
+        
+        if resolution and (width is None or height is None):
+            width, height = _RESOLUTION_PRESETS[resolution]  # --resolution choices are the preset names
+        
+        # Ensure valid dimensions
+        if width is None or height is None:
+            width, height = raylm.config.default_width, raylm.config.default_height
+        
+        result = raylm.generate_scene(
+            args.prompt,
+            width=width,
+            height=height,
+            quality=args.quality,
+            timeout=args.timeout,
+            no_render=args.no_render,
+            preview=args.preview,
+            animate=args.animate,
+            duration=args.duration,
+            fps=args.fps,
+            frames=args.frames,
+            resolution=resolution
+        )
+    else:
+        parser.print_help()
+        return 1
+    
+    # Handle result
+    if result['success']:
+        if 'output_file' in result:
+            print(f"\n✅ Operation completed successfully!")
+            print(f"📁 Scene file: {result['scene_file']}")
+            print(f"🖼️  Output file: {result['output_file']}")
+            
+            # Print performance metrics if available
+            metrics = result.get('metrics')
+            if metrics and hasattr(metrics, 'duration'):
+                print(f"⏱️  Total time: {metrics.duration:.2f}s")
+                if 'render_time' in metrics.metadata:
+                    print(f"🎬 Render time: {metrics.metadata['render_time']:.2f}s")
+                if 'verification_time' in metrics.metadata:
+                    print(f"🔍 Verification time: {metrics.metadata['verification_time']:.2f}s")
+                if 'verification_cached_tokens' in metrics.metadata:
+                    print(f"💾 Verifier prompt tokens from cache: {metrics.metadata['verification_cached_tokens']}")
+        else:
+            print(f"\n✅ Scene code generated successfully!")
+            print(f"📁 Scene file: {result['scene_file']}")
+    else:
+        print(f"\n❌ Operation failed: {result.get('error', 'Unknown error')}")
+        if 'scene_file' in result:
+            print(f"📁 Scene file: {result['scene_file']}")
+        return 1
+    return 0
 
-# Main function and command-line interface
-def main():
-    """Enhanced main function with comprehensive argument parsing."""
+
+def _serve_token_file(port: int) -> Path:
+    """Where --serve keeps the secret that --client must present for this port."""
+    return Path.home() / ".cache" / "raylm" / f"serve-{port}.token"
+
+def serve(parser: argparse.ArgumentParser, port: int) -> None:
+    """Answer command lines over local HTTP from one long-lived RayLM instance.
+    
+    POST /generate takes {"argv": [...], "cwd": "..."} with the same arguments
+    as the command line and returns {"status": exit_status, "output": text}.
+    Requests run one at a time, in the client's working directory. The
+    instance is rebuilt only when a request needs a different configuration;
+    logging options are taken from the server's own command line.
+    
+    Only JSON requests carrying the per-server token (X-RayLM-Token, read
+    from a 0600 file in the user's cache directory) are accepted. Browser
+    requests (any Origin header) are refused, and cwd must be an existing
+    directory owned by the server's user.
+    """
+    # Imported here: only the daemon needs the HTTP server
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    import hmac
+    import io
+    import secrets
+    
+    current: Dict[str, Optional[RayLM]] = {'raylm': None}
+    
+    # A fresh token per run; the file is recreated so it never keeps looser permissions
+    token = secrets.token_urlsafe(32)
+    token_file = _serve_token_file(port)
+    token_file.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    token_file.unlink(missing_ok=True)
+    with os.fdopen(os.open(token_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w") as f:
+        f.write(token)
+    
+    def _check_cwd(cwd: str) -> Optional[Path]:
+        """The resolved working directory, or None if it may not be used."""
+        try:
+            workdir = Path(cwd).resolve(strict=True)
+            owner = workdir.stat().st_uid
+        except (OSError, RuntimeError):
+            return None
+        if not workdir.is_dir() or (hasattr(os, "getuid") and owner != os.getuid()):
+            return None
+        return workdir
+    
+    def _handle(argv: List[str], cwd: str) -> Tuple[int, str]:
+        output = io.StringIO()
+        previous_cwd = os.getcwd()
+        with redirect_stdout(output), redirect_stderr(output):
+            try:
+                os.chdir(cwd)
+                args = parser.parse_args(argv)
+                _validate_args(args)
+                args.output_dir = Path(cwd) / args.output_dir
+                config = _config_from_args(args)
+                if current['raylm'] is None or current['raylm'].config != config:
+                    if current['raylm'] is not None:
+                        current['raylm'].close()
+                        current['raylm'] = None
+                    current['raylm'] = RayLM(config)
+                status = _run_command(current['raylm'], args, parser)
+            except SystemExit as e:
+                # argparse errors and --help
+                status = e.code if isinstance(e.code, int) else 1
+            except (RayLMError, OSError) as e:
+                logger.error(f"Request failed: {e}")
+                print(f"\n❌ Operation failed: {e}")
+                status = 1
+            except Exception as e:
+                logger.error(f"Unexpected error: {e}", exc_info=True)
+                print(f"\n❌ Operation failed: {e}")
+                status = 1
+            finally:
+                os.chdir(previous_cwd)
+        return status, output.getvalue()
+    
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/generate":
+                self.send_error(404)
+                return
+            if "Origin" in self.headers:
+                # Web pages can reach localhost too; the CLI client never sends Origin
+                self.send_error(403, "Cross-origin requests are not accepted")
+                return
+            if self.headers.get_content_type() != "application/json":
+                self.send_error(415, "Content-Type must be application/json")
+                return
+            if not hmac.compare_digest(self.headers.get("X-RayLM-Token", "").encode("utf-8"),
+                                       token.encode("utf-8")):
+                self.send_error(403, "Missing or wrong X-RayLM-Token")
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                argv, cwd = [str(arg) for arg in request["argv"]], str(request["cwd"])
+            except (ValueError, KeyError, TypeError) as e:
+                self.send_error(400, f"Bad request: {e}")
+                return
+            workdir = _check_cwd(cwd)
+            if workdir is None:
+                self.send_error(403, "cwd must be an existing directory owned by the server's user")
+                return
+            status, output = _handle(argv, str(workdir))
+            body = json.dumps({"status": status, "output": output}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            logger.info(f"{self.address_string()} - {format % args}")
+    
+    server = HTTPServer(("127.0.0.1", port), _Handler)
+    print(f"🚀 RayLM server listening on http://127.0.0.1:{port}/generate (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        token_file.unlink(missing_ok=True)
+        if current['raylm'] is not None:
+            current['raylm'].close()
+
+def _run_client(argv: List[str], port: int) -> int:
+    """Send a command line to a running --serve instance and print its output."""
+    import urllib.request
+    import urllib.error
+    
+    token_file = _serve_token_file(port)
+    try:
+        token = token_file.read_text(encoding="utf-8").strip()
+    except OSError:
+        print(f"❌ No RayLM server token at {token_file}; start one with --serve --port {port}")
+        return 1
+    
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/generate",
+        data=json.dumps({"argv": argv, "cwd": os.getcwd()}).encode("utf-8"),
+        headers={"Content-Type": "application/json", "X-RayLM-Token": token}
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            reply = json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        print(f"❌ The RayLM server refused the request: {e.code} {e.reason}")
+        return 1
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"❌ Could not reach the RayLM server on port {port}: {e}")
+        return 1
+    print(reply["output"], end="")
+    return reply["status"]
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser (once; --serve reuses it for every request)."""
     
     parser = argparse.ArgumentParser(
         description="""RayLM v3.6: Enhanced AI-Powered POV-Ray Scene Generator
@@ -2250,6 +3473,10 @@ EXAMPLES:
   # Verbose output for debugging
   python raylm3.6.py "Complex scene" --verbose
   
+  # Keep a warm instance running, then send it commands
+  python raylm3.6.py --serve &
+  python raylm3.6.py --client "A glass teapot" --preview
+  
 For more information, visit: https://github.com/your-repo/raylm
         """
     )
@@ -2257,6 +3484,18 @@ For more information, visit: https://github.com/your-repo/raylm
     # Basic arguments
     parser.add_argument("prompt", nargs="?", help="The prompt for scene generation")
     parser.add_argument("--prompt-file", type=Path, help="File containing the prompt")
+    parser.add_argument("--prompts-file", type=Path,
+                       help="JSONL file of prompts to run in one process; each line is a JSON string "
+                            "or an object with \"prompt\" and optional per-prompt options "
+                            "(width, height, resolution, quality, animate, fps, ...)")
+    parser.add_argument("--batch", action="store_true",
+                       help="Treat each non-empty line of --prompt-file as a separate prompt")
+    parser.add_argument("--batch-single-request", action="store_true",
+                       help="With --batch, generate all scenes in one API request (JSON response)")
+    parser.add_argument("--submit-batch", action="store_true",
+                       help="With --batch, submit prompts to the offline Batch API and exit")
+    parser.add_argument("--collect-batch", metavar="BATCH_ID",
+                       help="Wait for a submitted batch, then save and render its scenes")
     
     # Configuration options
     parser.add_argument("--output-dir", type=Path, default=Path("./output"), 
@@ -2266,7 +3505,7 @@ For more information, visit: https://github.com/your-repo/raylm
     # Resolution and quality
     resolution_group = parser.add_mutually_exclusive_group()
     resolution_group.add_argument("--resolution", 
-                                 choices=["480p", "720p", "1080p", "1440p", "4k"], 
+                                 choices=list(_RESOLUTION_PRESETS), 
                                  default="1080p", 
                                  help="Output resolution (default: 1080p)")
     parser.add_argument("--width", type=int, help="Custom width in pixels")
@@ -2299,6 +3538,23 @@ For more information, visit: https://github.com/your-repo/raylm
                        help="Model for code verification (default: zaguanai/claude-sonnet-4.5-latest)")
     parser.add_argument("--no-verification", action="store_true", 
                        help="Skip code verification step")
+    parser.add_argument("--temperature", type=float, default=0.7,
+                       help="Generator temperature; 0 enables the response cache (default: 0.7)")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Disable the LLM response cache")
+    parser.add_argument("--cache-scenes", action="store_true",
+                       help="Reuse the finished scene when the same prompt is run again "
+                            "(stored in ~/.cache/raylm/scenes)")
+    parser.add_argument("--no-structured-output", action="store_true",
+                       help="Request plain-text code instead of JSON schema output")
+    parser.add_argument("--no-stream", action="store_true",
+                       help="Wait for complete API responses instead of streaming them")
+    parser.add_argument("--no-prompt-cache", action="store_true",
+                       help="Send the verifier system prompt without a cache_control marker "
+                            "(the marker is only ever sent to Claude verifier models)")
+    parser.add_argument("--template", action="store_true",
+                       help="Have the model fill a fixed scene template (camera, light, objects) "
+                            "instead of writing the whole scene")
     
     # Animation options
     parser.add_argument("--animate", action="store_true", 
@@ -2309,10 +3565,26 @@ For more information, visit: https://github.com/your-repo/raylm
                        help="Animation frames per second (default: 30)")
     parser.add_argument("--frames", type=int, 
                        help="Number of animation frames (overrides --duration)")
+    parser.add_argument("--hw-encode", action="store_true",
+                       help="Encode animations with a hardware H.264 encoder when available")
+    parser.add_argument("--stream-frames", action="store_true",
+                       help="Encode frames while rendering and delete each frame once encoded, "
+                            "keeping at most 30 frames on disk")
+    parser.add_argument("--cluster", choices=["ray"], dest="cluster_backend",
+                       help="Render animation frames on a cluster (requires the ray package)")
+    parser.add_argument("--cluster-address", default="auto",
+                       help="Ray cluster address (default: auto)")
+    parser.add_argument("--render-workers", "--render-jobs", type=int, dest="render_workers",
+                       help="Frames rendered at once; capped by available memory (default: CPU count)")
+    parser.add_argument("--frame-memory", type=int, dest="frame_memory_mb",
+                       help="Estimated peak memory of one frame render in MB, used to cap "
+                            "--render-workers (default: 512; 0 disables the cap)")
     
     # Advanced options
     parser.add_argument("--verbose", "-v", action="store_true", 
                        help="Enable verbose logging")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                       help="Print nothing to stdout (for scripts; check the exit status and log)")
     parser.add_argument("--log-file", type=Path, 
                        help="Log file path (default: raylm.log)")
     parser.add_argument("--dry-run", action="store_true", 
@@ -2322,124 +3594,66 @@ For more information, visit: https://github.com/your-repo/raylm
     parser.add_argument("--debug", action="store_true", 
                        help="Enable debug mode with extensive logging")
     
-    args = parser.parse_args()
+    # Daemon mode
+    parser.add_argument("--serve", action="store_true",
+                       help="Keep one RayLM instance running and accept commands from --client")
+    parser.add_argument("--client", action="store_true",
+                       help="Send this command line to a running --serve instance")
+    parser.add_argument("--port", type=int, default=8765,
+                       help="Local port for --serve and --client (default: 8765)")
+    
+    return parser
+
+def main():
+    """Enhanced main function with comprehensive argument parsing."""
+    
+    argv = sys.argv[1:]
+    if "--client" in argv:
+        # The client only forwards its arguments, so it does not build the full parser;
+        # everything except the client options is passed on verbatim
+        forwarded, port, skip_next = [], 8765, False
+        for i, arg in enumerate(argv):
+            if skip_next:
+                skip_next = False
+            elif arg == "--port" or arg.startswith("--port="):
+                value = argv[i + 1] if arg == "--port" and i + 1 < len(argv) else arg.partition("=")[2]
+                skip_next = arg == "--port"
+                try:
+                    port = int(value)
+                except ValueError:
+                    print(f"❌ Invalid --port value: {value!r}")
+                    sys.exit(2)
+            elif arg != "--client":
+                forwarded.append(arg)
+        sys.exit(_run_client(forwarded, port))
+    
+    parser = _build_parser()
+    args = parser.parse_args(argv)
     
     # Configure logging level
     log_level = "DEBUG" if args.debug else ("INFO" if args.verbose else "WARNING")
     logger = setup_logging(log_level, str(args.log_file) if args.log_file else None)
     
+    _load_env()
+    
+    def _on_interrupt(signum, frame):
+        # Stop background retries and renders too, then interrupt the main thread as usual
+        cancel_all()
+        signal.default_int_handler(signum, frame)
+    
+    signal.signal(signal.SIGINT, _on_interrupt)
+    
+    raylm = None
     try:
-        # Initialize RayLM
-        config = RayLMConfig(
-            output_dir=args.output_dir,
-            generator_model=args.generator_model or "zaguanai/gemini-3-pro-preview",
-            verifier_model=args.verifier_model or "zaguanai/claude-sonnet-4.5-latest" if not args.no_verification else None,
-            default_timeout=args.timeout or 300
-        )
+        _validate_args(args)
+        if args.serve:
+            serve(parser, args.port)
+            sys.exit(0)
         
-        raylm = RayLM(config)
-        
-        if args.render:
-            # Render existing file
-            result = raylm.render_existing_file(
-                args.render,
-                width=args.width,
-                height=args.height,
-                quality=args.quality,
-                timeout=args.timeout
-            )
-        elif args.prompt_file:
-            # Read prompt from file
-            if not args.prompt_file.exists():
-                logger.error(f"Prompt file does not exist: {args.prompt_file}")
-                sys.exit(1)
-            
-            prompt = args.prompt_file.read_text().strip()
-            
-            if not prompt:
-                logger.error("Prompt file is empty")
-                sys.exit(1)
-            
-            # Handle resolution presets
-            resolution = args.resolution
-            width, height = args.width, args.height
-            
-            if resolution and (width is None or height is None):
-                width, height = raylm._parse_resolution_preset(resolution)
-            
-            # Ensure valid dimensions
-            if width is None or height is None:
-                width, height = raylm.config.default_width, raylm.config.default_height
-            
-            result = raylm.generate_scene(
-                prompt,
-                width=width,
-                height=height,
-                quality=args.quality,
-                timeout=args.timeout,
-                no_render=args.no_render,
-                preview=args.preview,
-                animate=args.animate,
-                duration=args.duration,
-                fps=args.fps,
-                frames=args.frames,
-                resolution=resolution
-            )
-        elif args.prompt:
-            # Handle resolution presets
-            resolution = args.resolution
-            width, height = args.width, args.height
-            
-            if resolution and (width is None or height is None):
-                width, height = raylm._parse_resolution_preset(resolution)
-            
-            # Ensure valid dimensions
-            if width is None or height is None:
-                width, height = raylm.config.default_width, raylm.config.default_height
-            
-            result = raylm.generate_scene(
-                args.prompt,
-                width=width,
-                height=height,
-                quality=args.quality,
-                timeout=args.timeout,
-                no_render=args.no_render,
-                preview=args.preview,
-                animate=args.animate,
-                duration=args.duration,
-                fps=args.fps,
-                frames=args.frames,
-                resolution=resolution
-            )
-        else:
-            parser.print_help()
-            sys.exit(1)
-        
-        # Handle result
-        if result['success']:
-            if 'output_file' in result:
-                print(f"\n✅ Operation completed successfully!")
-                print(f"📁 Scene file: {result['scene_file']}")
-                print(f"🖼️  Output file: {result['output_file']}")
-                
-                # Print performance metrics if available
-                metrics = result.get('metrics')
-                if metrics and hasattr(metrics, 'duration'):
-                    print(f"⏱️  Total time: {metrics.duration:.2f}s")
-                    if 'render_time' in metrics.metadata:
-                        print(f"🎬 Render time: {metrics.metadata['render_time']:.2f}s")
-                    if 'verification_time' in metrics.metadata:
-                        print(f"🔍 Verification time: {metrics.metadata['verification_time']:.2f}s")
-            else:
-                print(f"\n✅ Scene code generated successfully!")
-                print(f"📁 Scene file: {result['scene_file']}")
-        else:
-            print(f"\n❌ Operation failed: {result.get('error', 'Unknown error')}")
-            if 'scene_file' in result:
-                print(f"📁 Scene file: {result['scene_file']}")
-            sys.exit(1)
+        raylm = RayLM(_config_from_args(args))
+        sys.exit(_run_command(raylm, args, parser))
             
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, RayLMCancelledError):
         logger.info("Operation cancelled by user")
         sys.exit(1)
     except (RayLMConfigurationError, RayLMValidationError) as e:
@@ -2451,6 +3665,10 @@ For more information, visit: https://github.com/your-repo/raylm
     except Exception as e:
         logger.error(f"Unexpected error: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        if raylm is not None:
+            raylm.close()
+        close_clients()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file